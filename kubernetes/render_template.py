@@ -18,7 +18,7 @@ Parameters:
     -h, --help                              Displays this help
 """
 
-from jinja2 import Environment,FileSystemLoader
+from jinja2 import Environment,FileSystemLoader,FileSystemBytecodeCache
 import yaml
 import base64
 import string
@@ -27,7 +27,6 @@ from docopt import docopt
 import os
 import sys
 import tempfile
-import shutil
 
 
 def random_password(length=30, debug=False, alphanumeric=False):
@@ -53,18 +52,21 @@ def fix_1_18(filename: str) -> None:
     :param filename: The file to fix
     :type filename: str
     """
-    # create a temporary file
-    output_file = tempfile.mktemp(suffix=".yaml")
+    with open(filename, "rb") as reader:
+        org_content = reader.read()
 
-    with open(filename, "r") as reader:
-        with open(output_file, "w") as writer:
-            for line in reader:
-                line = line.replace("extensions/v1beta1", "apps/v1")
+    new_content = org_content.replace(b"extensions/v1beta1", b"apps/v1")
 
-                writer.write(line)
+    if new_content == org_content:
+        return
 
-    # replace the original file
-    shutil.move(output_file, filename)
+    # write to a temporary file and replace the original file
+    output_file = filename + ".tmp"
+
+    with open(output_file, "wb") as writer:
+        writer.write(new_content)
+
+    os.replace(output_file, filename)
 
 
 def main():
@@ -85,8 +87,11 @@ def main():
         print("Error: {} already exists".format(output_file))
         sys.exit(1)
 
-    # set the environment and add the password function
-    env = Environment(loader=FileSystemLoader(os.path.dirname(template_file)))
+    # set the environment and add the password function - the compiled
+    # templates are cached to speed up repeated runs
+    env = Environment(loader=FileSystemLoader(os.path.dirname(template_file)),
+                      bytecode_cache=FileSystemBytecodeCache(tempfile.gettempdir()),
+                      auto_reload=False)
     env.globals.update(random_password=random_password)
 
     # load the config
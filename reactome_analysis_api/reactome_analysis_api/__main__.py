@@ -1,24 +1,33 @@
 #!/usr/bin/env python3
 
+import codecs
 import csv
-import json
+import io
+import itertools
 import logging
+import mmap
+import orjson
 import uuid
 import sys
 import os
+import tempfile
 
 import connexion
-from flask import redirect, request, abort, make_response
+from flask import redirect, request, abort, make_response, Response
 from prometheus_client import make_wsgi_app, Counter
 from reactome_analysis_api import encoder
 from reactome_analysis_utils.reactome_storage import ReactomeStorage, ReactomeStorageException
 from reactome_analysis_utils.reactome_logging import get_default_logging_handlers
+from werkzeug.http import HTTP_STATUS_CODES
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
 from reactome_analysis_api.searcher.public_data_searcher import PublicDatasetSearcher
 
 app = connexion.App(__name__, specification_dir='./swagger/')
 app.app.json_encoder = encoder.JSONEncoder
 
+# limit the size of uploaded files to 512 MB
+app.app.config["MAX_CONTENT_LENGTH"] = 512 * 1024 * 1024
+
 # show the metrics on a specific path
 app_dispatch = DispatcherMiddleware(app, {
     '/metrics': make_wsgi_app()
@@ -48,9 +57,23 @@ LOGGER.setLevel(logging.DEBUG)
 UPLOAD_ERRORS = Counter("reactome_api_upload_errors", 
                         "Invalid file uploads", labelnames=["extension"])
 
+# the possible labels are known, therefore the labelled counters are only looked up once
+UPLOAD_ERROR_COUNTERS = {extension: UPLOAD_ERRORS.labels(extension=extension)
+                         for extension in (".xlsx", "other", "too large", "malformatted csv")}
+
 
 def main():
-    app.run(port=8080, debug=True)
+    # only use flask's development server in debug mode
+    if os.getenv("REACTOME_API_DEBUG", "false").lower() == "true":
+        app.run(port=8080, debug=True)
+    else:
+        # waitress is only needed when running the standalone server
+        from waitress import serve
+
+        # every status request using the "wait" parameter blocks one thread for up to 30 seconds
+        # (maximum set in swagger.yaml). Therefore, at most 16 clients can wait at the same time.
+        serve(app_dispatch, host="0.0.0.0", port=8080, threads=16)
+
 
 def custom_abort(code: int, message: str):
     """Creates a custom error response. This is needed as
@@ -64,24 +87,170 @@ def custom_abort(code: int, message: str):
     :return: The reponse
     :rtype: Response
     """
-    resp = make_response(json.dumps({
+    resp = make_response(orjson.dumps({
         "detail": message,
         "status": code,
-        "title": "Internal Server Error",
+        "title": HTTP_STATUS_CODES.get(code, "Unknown Error"),
         "type": "about:blank"
-    }), 500)
+    }), code)
 
     resp.headers["Content-Type"] = "application/json"
 
     return resp
 
 
+def _invalid_file_response(user_filename: str, error: Exception):
+    """Creates the error response for uploaded files that
+    cannot be read as text files.
+
+    :param user_filename: The name of the uploaded file
+    :type user_filename: str
+    :param error: The error raised while reading the file
+    :type error: Exception
+    :return: The response
+    :rtype: Response
+    """
+    # get the extension
+    (name, extension) = os.path.splitext(user_filename)
+
+    if extension == ".xlsx":
+        UPLOAD_ERROR_COUNTERS[".xlsx"].inc()
+        LOGGER.debug("Excel file upload")
+        return custom_abort(400, "MS Excel files are not supported. Please save as a text file (txt, csv, or tsv).")
+    else:
+        LOGGER.info("Invalid file {name} uploaded: {error}".format(name = user_filename, error=str(error)))
+        UPLOAD_ERROR_COUNTERS["other"].inc()
+        return custom_abort(400, "Uploaded file is not a text file.")
+
+
+def _read_upload_lines(stream):
+    """Returns the decoded lines of an uploaded file.
+
+    Uploads that were spooled to disk are memory-mapped and read directly
+    from the page cache. All other uploads are decoded through a text
+    wrapper.
+
+    :param stream: The uploaded file's stream
+    :return: A generator returning every line as a string
+    :rtype: Iterator[str]
+    """
+    file_no = None
+
+    # fileno forces spooled files that are still kept in memory to be written to disk
+    if getattr(stream, "_rolled", True):
+        try:
+            file_no = stream.fileno()
+        except (AttributeError, OSError):
+            file_no = None
+
+    if file_no is not None and os.fstat(file_no).st_size > 0:
+        with mmap.mmap(file_no, 0, access=mmap.ACCESS_READ) as mapped_file:
+            for line in iter(mapped_file.readline, b""):
+                yield line.decode("UTF-8")
+    else:
+        text_stream = io.TextIOWrapper(stream, encoding="UTF-8", newline="")
+
+        try:
+            yield from text_stream
+        finally:
+            # prevent the wrapper from closing the uploaded file's stream
+            text_stream.detach()
+
+
+def _get_delimiter(lines: list):
+    """Guesses the delimiter used in a text file.
+
+    Delimiters that occur equally often in all data lines (and once
+    less or equally often in the header) are preferred. Among these,
+    the most frequent one in the header is used. In case of ties, tab
+    is preferred over semicolon and comma.
+
+    :param lines: The first lines of the file, starting with the header
+    :type lines: list
+    :return: The delimiter or None if none of the supported ones was found
+    :rtype: str
+    """
+    header_counts = {delimiter: lines[0].count(delimiter) for delimiter in ("\t", ";", ",")}
+    consistent_delimiters = list()
+
+    for delimiter, header_count in header_counts.items():
+        if header_count == 0:
+            continue
+
+        line_counts = {line.count(delimiter) for line in lines[1:] if line.strip()}
+
+        if len(line_counts) < 2 and line_counts <= {header_count, header_count + 1}:
+            consistent_delimiters.append(delimiter)
+
+    candidates = consistent_delimiters if len(consistent_delimiters) > 0 else list(header_counts.keys())
+    delimiter = max(candidates, key=header_counts.get)
+
+    if header_counts[delimiter] == 0:
+        return None
+
+    return delimiter
+
+
+def _split_lines(lines, delimiter: str):
+    """Splits the lines of a delimited text file into their fields.
+
+    Lines are simply split at the delimiter as long as no quote character
+    was encountered. Starting with the first line containing a quote, the
+    remaining lines are parsed using the (slower) csv module.
+
+    :param lines: An iterator over the file's lines
+    :type lines: Iterator[str]
+    :param delimiter: The delimiter to use
+    :type delimiter: str
+    :return: A generator returning the fields of every line
+    :rtype: Iterator[list]
+    """
+    for line in lines:
+        if '"' in line:
+            yield from csv.reader(itertools.chain([line], lines), delimiter=delimiter)
+            return
+
+        yield line.rstrip("\r\n").split(delimiter)
+
+
+def _stream_upload_response(return_object: dict, result_file):
+    """Creates the JSON-encoded response for an upload including the
+    converted file. The file's content is added as the "data" field
+    in chunks to avoid creating the complete response in memory.
+
+    :param return_object: The response's remaining fields
+    :type return_object: dict
+    :param result_file: The binary file object containing the converted file
+    :return: A generator returning the response in chunks
+    :rtype: Iterator[bytes]
+    """
+    decoder = codecs.getincrementaldecoder("UTF-8")()
+
+    try:
+        # add the data as last field of the object
+        yield orjson.dumps(return_object)[:-1] + b', "data": "'
+
+        for chunk in iter(lambda: result_file.read(65536), b""):
+            # only use the JSON encoder to escape the string
+            yield orjson.dumps(decoder.decode(chunk))[1:-1]
+
+        yield orjson.dumps(decoder.decode(b"", final=True))[1:-1] + b'"}'
+    finally:
+        result_file.close()
+
+
 @app.route("/")
 def show_mainpage():
     return redirect("/0.1/ui")
 
 @app.route("/upload", methods=["POST"])
 def process_file_upload():
+    # reject files that are too large before reading the request's body
+    if request.content_length is not None and request.content_length > app.app.config["MAX_CONTENT_LENGTH"]:
+        UPLOAD_ERROR_COUNTERS["too large"].inc()
+        return custom_abort(413, "The uploaded file is too large. Files must not exceed {} MB."
+                            .format(app.app.config["MAX_CONTENT_LENGTH"] // (1024 * 1024)))
+
     # test whether the file should be stored or returned
     store_file = request.args.get('store', 'true').lower() == "true"
 
@@ -98,143 +267,158 @@ def process_file_upload():
 
     # initialize the return object
     return_object = {"sample_names": None, "top_identifiers": list(), "n_lines": None}
-    return_lines = list()
+    # large results are moved to disk instead of being kept in memory
+    result_file = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024, mode="w+b")
+    # the text wrapper buffers the written lines and encodes them in batches
+    result_writer = io.TextIOWrapper(result_file, encoding="UTF-8", newline="")
     n_samples = -1
 
-    # read the file
+    # read the uploaded file line by line instead of loading all lines into memory
+    all_lines = _read_upload_lines(user_file.stream)
+
     try:
-        all_lines = [line.decode("UTF-8") for line in user_file.readlines()]
-    except Exception as e:
-        # get the extension
-        (name, extension) = os.path.splitext(user_filename)
-
-        if extension == ".xlsx":
-            UPLOAD_ERRORS.labels(extension=extension).inc()
-            LOGGER.debug("Excel file upload")
-            return custom_abort(400, "MS Excel files are not supported. Please save as a text file (txt, csv, or tsv).")
-        else:
-            LOGGER.info("Invalid file {name} uploaded: {error}".format(name = user_filename, error=str(e)))
-            UPLOAD_ERRORS.labels(extension="other").inc()
-            return custom_abort(400, "Uploaded file is not a text file.")
-
-    # make sure the file is not empty
-    if len(all_lines) < 1:
-        LOGGER.info("Empty file uploaded.")
-        return custom_abort(400, "The uploaded file seems to be empty.")
-
-    # guess the delimiter
-    delimiter = None
-    if "\t" in all_lines[0]:
-        delimiter = "\t"
-    elif ";" in all_lines[0]:
-        delimiter = ";"
-    elif "," in all_lines[0]:
-        delimiter = ","
-
-    if not delimiter:
-        return custom_abort(500, "Failed to detect used delimiter")
+        # the first lines are used to guess the file's format
+        first_lines = list(itertools.islice(all_lines, 10))
+    except UnicodeDecodeError as e:
+        return _invalid_file_response(user_filename, e)
 
     try:
-        csv_reader = csv.reader(all_lines, delimiter=delimiter)
-        header_line = csv_reader.__next__()
-        current_line = 1
-    except Exception:
-        LOGGER.info("Malformatted file encountered.")
-        UPLOAD_ERRORS.labels(extension="malformatted csv").inc()
-        return custom_abort(400, "Malformatted text file. Ensure that quoted fields do not span multiple lines.")
-
-    sample_names = None
-    gene_ids = list()
-
-    # process each entry
-    for line in csv_reader:
-        current_line += 1
-
-        if n_samples == -1:
-            n_samples = len(line)
-
-            # set the sample names
-            if sample_names is None:
-                # make sure the sample names are unique
-                if len(header_line) == n_samples:
-                    sample_names = header_line[1:]
-                elif len(header_line) == n_samples - 1:
-                    sample_names = header_line
-                else:
-                    return custom_abort(400, "Number of header columns does not match number of samples.")
-
-                # remove empty sample names
-                sample_names = [sample_name for sample_name in sample_names if sample_name != ""]
-                n_samples = len(sample_names)
-
-                # make sure the sample names are unique
-                if len(sample_names) != len(set(sample_names)):
-                    return custom_abort(400, "Duplicate sample names detected. All sample names (labels in the first line) "
-                                "must be unique")
-
-                # save the sample names
-                return_object["sample_names"] = sample_names
-
-            # make sure the file was parsed more or less correctly
-            if n_samples < 2:
-                return custom_abort(400, "Failed to parse the file. Only one column detected.")
-
-            # start creating the converted object by adding the header line
-            return_lines.append("\t" + "\t".join(sample_names))
-
-        # make sure the number of samples is OK
-        if len(line) - 1 < n_samples:
-            return custom_abort(400, "Different number of entries in line {}. File contains {} columns but line {} contains {}"
-                  .format(str(current_line), str(n_samples), str(current_line), str(len(line))))
-
-        # make sure the line (= gene / protein id) is not empty
-        if len(line[0].strip()) == 0:
-            continue
+        # make sure the file is not empty
+        if len(first_lines) < 1 or len(first_lines[0]) < 1:
+            LOGGER.info("Empty file uploaded.")
+            return custom_abort(400, "The uploaded file seems to be empty.")
 
-        # make sure the gene ids are unique
-        gene_ids.append(line[0].strip())
+        delimiter = _get_delimiter(first_lines)
 
-        # save the first few identifiers as samples
-        if current_line < 10:
-            return_object["top_identifiers"].append(line[0])
+        if not delimiter:
+            return custom_abort(500, "Failed to detect used delimiter")
+
+        try:
+            csv_reader = _split_lines(itertools.chain(first_lines, all_lines), delimiter=delimiter)
+            header_line = csv_reader.__next__()
+            current_line = 1
+        except Exception:
+            LOGGER.info("Malformatted file encountered.")
+            UPLOAD_ERROR_COUNTERS["malformatted csv"].inc()
+            return custom_abort(400, "Malformatted text file. Ensure that quoted fields do not span multiple lines.")
+
+        sample_names = None
+        # the dict keeps the order of the identifiers
+        gene_ids = dict()
+
+        # process each entry
+        try:
+            for line in csv_reader:
+                current_line += 1
 
-        # save the line
-        return_lines.append("\t".join(line[0:n_samples+1]))
+                if n_samples == -1:
+                    n_samples = len(line)
 
-    # make sure the gene's are unqiue
-    if len(gene_ids) != len(set(gene_ids)):
-        custom_abort(400, "Duplicate gene identifiers detected.")
+                    # set the sample names
+                    if sample_names is None:
+                        # make sure the sample names are unique
+                        if len(header_line) == n_samples:
+                            sample_names = header_line[1:]
+                        elif len(header_line) == n_samples - 1:
+                            sample_names = header_line
+                        else:
+                            return custom_abort(400, "Number of header columns does not match number of samples.")
+
+                        # remove empty sample names and make sure the remaining ones are unique
+                        unique_sample_names = set()
+                        filtered_sample_names = list()
+
+                        for sample_name in sample_names:
+                            if sample_name == "":
+                                continue
+
+                            if sample_name in unique_sample_names:
+                                return custom_abort(400, "Duplicate sample names detected. All sample names (labels in the first line) "
+                                            "must be unique")
+
+                            unique_sample_names.add(sample_name)
+                            filtered_sample_names.append(sample_name)
+
+                        sample_names = filtered_sample_names
+                        n_samples = len(sample_names)
+
+                        # save the sample names
+                        return_object["sample_names"] = sample_names
+
+                    # make sure the file was parsed more or less correctly
+                    if n_samples < 2:
+                        return custom_abort(400, "Failed to parse the file. Only one column detected.")
+
+                    # start creating the converted object by adding the header line
+                    result_writer.write("\t" + "\t".join(sample_names))
+
+                # make sure the number of samples is OK
+                if len(line) - 1 < n_samples:
+                    return custom_abort(400, "Different number of entries in line {}. File contains {} columns but line {} contains {}"
+                          .format(str(current_line), str(n_samples), str(current_line), str(len(line))))
+
+                # make sure the line (= gene / protein id) is not empty
+                gene_id = line[0].strip()
+
+                if not gene_id:
+                    continue
+
+                # make sure the gene ids are unique
+                if gene_id in gene_ids:
+                    return custom_abort(400, "Duplicate gene identifier '{}' detected in line {}."
+                                        .format(gene_id, str(current_line)))
+
+                gene_ids[gene_id] = None
+
+                # save the line
+                result_writer.write("\n" + "\t".join(line[0:n_samples+1]))
+        except UnicodeDecodeError as e:
+            return _invalid_file_response(user_filename, e)
+        except csv.Error:
+            LOGGER.info("Malformatted file encountered.")
+            UPLOAD_ERROR_COUNTERS["malformatted csv"].inc()
+            return custom_abort(400, "Malformatted text file. Ensure that quoted fields do not span multiple lines.")
+
+        # save the first few identifiers as samples
+        return_object["top_identifiers"] = list(itertools.islice(gene_ids, 8))
+    finally:
+        # release the memory map or text wrapper of the uploaded file
+        all_lines.close()
 
     # save the results
     return_object["n_lines"] = current_line
 
-    # create the complete result string
-    result_string = "\n".join(return_lines)
+    # flush the remaining lines and release the result file
+    result_writer.detach()
+    result_file.seek(0)
 
     # add the file if it shouldn't be saved
     if not store_file:
-        return_object["data"] = result_string
+        # stream the converted file as part of the JSON response
+        response_object = Response(_stream_upload_response(return_object, result_file))
     else:
         # store the file
         try:
             storage = ReactomeStorage()
 
-            # create an identifier
-            token = "rqu_" + str(uuid.uuid1())
+            # create an identifier and save the data - expire after 6 hours.
+            # The data is only stored if the identifier does not exist yet.
+            token = "rqu_" + uuid.uuid4().hex
 
-            while storage.request_token_exists(token):
-                token = "rqu_" + str(uuid.uuid1())
-
-            # save the data - expire after 6 hours
-            storage.set_request_data(token=token, data=result_string, expire=60*60*6)
+            while not storage.set_request_data_nx(token=token, data=result_file, expire=60*60*6):
+                token = "rqu_" + uuid.uuid4().hex
+                result_file.seek(0)
 
             return_object["data_token"] = token
         except ReactomeStorageException as e:
             LOGGER.error("Failed to store request data: " + str(e))
             return custom_abort(500, "Failed to store request data. Please try again later.")
+        finally:
+            result_file.close()
+
+        # return the JSON data
+        response_object = make_response(orjson.dumps(return_object))
 
-    # return the JSON data
-    response_object = make_response(json.dumps(return_object))
     # Using the content-type "text/html" instead of the more
     # appropriate "application/json" to circumvent the lacking
     # support for JSON in GWT (used by Reactome's pathway browser)
@@ -2,26 +2,53 @@ import logging
 import socket
 import uuid
 import zlib
-import json
 
 import connexion
+import orjson
 import prometheus_client
-from flask import abort
+from flask import abort, Response
 from reactome_analysis_api import methods, input_deserializer
-from reactome_analysis_api.encoder import JSONEncoder
+from reactome_analysis_api import encoder
 from reactome_analysis_api.models.analysis_status import AnalysisStatus
 from reactome_analysis_api.models.data_type import DataType
-from reactome_analysis_utils.reactome_mq import ReactomeMQ, ReactomeMQException
+from reactome_analysis_utils.reactome_mq import get_thread_mq, ReactomeMQException
 from reactome_analysis_utils.reactome_storage import ReactomeStorage, ReactomeStorageException
 from reactome_analysis_utils.models.analysis_request import AnalysisRequest
 
 LOGGER = logging.getLogger(__name__)
 STARTED_ANALYSIS_COUNTER = prometheus_client.Counter('reactome_api_started_analyses',
                                                      'Analysis requests started through the API', ["client"])
+# the labelled counters for all known clients are only looked up once
+STARTED_ANALYSIS_COUNTERS = {client: STARTED_ANALYSIS_COUNTER.labels(client=client)
+                             for client in ("Unknown", "ReactomeGSA R", "PathwayBrowser")}
 
 MISSING_DATA_TOKEN_COUNTER = prometheus_client.Counter('reactome_api_missing_token',
                                                        'Missing data for data tokens.')
 
+# the supported data types never change and are therefore only encoded once
+_DATA_TYPES = [
+    DataType(id="rnaseq_counts",
+             name="RNA-seq (raw counts)",
+             description="Raw RNA-seq based read counts per gene (recommended)."),
+    DataType(id="rnaseq_norm",
+             name="RNA-seq (normalized)",
+             description="log2 transformed, normalized RNA-seq based read counts per gene (f.e. RPKM, TPM)"),
+    DataType(id="proteomics_int",
+             name="Proteomics (intensity)",
+             description="Intensity-based quantitative proteomics data (for example, "
+                         "iTRAQ/TMT or intensity-based label-free quantitation). Values "
+                         "must be log2 transformed."),
+    DataType(id="proteomics_sc",
+             name="Proteomics (spectral counts)",
+             description="Raw spectral-counts of label-free proteomics experiments"),
+    DataType(id="microarray_norm",
+             name="Microarray (normalized)",
+             description="Normalized and log2 transformed microarray-based gene expression values.")
+
+]
+
+_DATA_TYPES_JSON = encoder.dumps(_DATA_TYPES)
+
 
 def list_methods():  # noqa: E501
     """Lists the available analysis methods
@@ -39,28 +66,7 @@ def list_types():
     Lists the supported data types
     :return: List[DataType]
     """
-    data_types = [
-        DataType(id="rnaseq_counts",
-                 name="RNA-seq (raw counts)",
-                 description="Raw RNA-seq based read counts per gene (recommended)."),
-        DataType(id="rnaseq_norm",
-                 name="RNA-seq (normalized)",
-                 description="log2 transformed, normalized RNA-seq based read counts per gene (f.e. RPKM, TPM)"),
-        DataType(id="proteomics_int",
-                 name="Proteomics (intensity)",
-                 description="Intensity-based quantitative proteomics data (for example, "
-                             "iTRAQ/TMT or intensity-based label-free quantitation). Values "
-                             "must be log2 transformed."),
-        DataType(id="proteomics_sc",
-                 name="Proteomics (spectral counts)",
-                 description="Raw spectral-counts of label-free proteomics experiments"),
-        DataType(id="microarray_norm",
-                 name="Microarray (normalized)",
-                 description="Normalized and log2 transformed microarray-based gene expression values.")
-
-    ]
-
-    return data_types
+    return Response(_DATA_TYPES_JSON, mimetype="application/json")
 
 
 def start_analysis(body):  # noqa: E501
@@ -88,11 +94,9 @@ def start_analysis(body):  # noqa: E501
     elif connexion.request.content_type == "application/gzip":
         LOGGER.debug("Received gzipped analysis request. Decompressing...")
 
-        decompressed_string = zlib.decompress(connexion.request.data)
-        analysis_dict = json.loads(decompressed_string)
-        
-        # free the memory again
-        del decompressed_string
+        # zlib and gzip headers are both accepted (32 + MAX_WBITS). The
+        # decompressed data is only referenced until it is parsed.
+        analysis_dict = orjson.loads(zlib.decompress(connexion.request.data, 32 + zlib.MAX_WBITS))
     else:
         LOGGER.debug("Invalid analysis request submitted. Request body does not describe a JSON object.")
         abort(406, "Invalid analysis request submitted. Request body does not describe a JSON object.")
@@ -113,71 +117,69 @@ def start_analysis(body):  # noqa: E501
         
         abort(400, "Invalid analysis request submitted")
 
-    # make sure all datasets have unique names
-    all_names = [dataset.name for dataset in analysis_request.datasets]
+    # make sure all datasets have unique names and the analysis design is present
+    dataset_names = set()
+
+    for dataset in analysis_request.datasets:
+        if dataset.name in dataset_names:
+            LOGGER.debug("Analysis request contains duplicate names")
+            abort(406, "Datasets must not have duplicate names")
 
-    if len(all_names) != len(set(all_names)):
-        LOGGER.debug("Analysis request contains duplicate names")
-        abort(406, "Datasets must not have duplicate names")
+        dataset_names.add(dataset.name)
 
-    # make sure the analysis design is present
-    for n_dataset in range(0, len(analysis_request.datasets)):
-        if not analysis_request.datasets[n_dataset].design:
+        if not dataset.design:
             LOGGER.debug("Analysis request misses design")
-            abort(406, "Invalid request. Dataset '{name}' misses the required experimental design.".format(name=analysis_request.datasets[n_dataset].name))
-        if not analysis_request.datasets[n_dataset].design.comparison:
+            abort(406, "Invalid request. Dataset '{name}' misses the required experimental design.".format(name=dataset.name))
+        if not dataset.design.comparison:
             LOGGER.debug("Analysis request misses design comparison")
-            abort(406, "Invalid request. Dataset '{name}' misses the required comparison specification.".format(name=analysis_request.datasets[n_dataset].name))
+            abort(406, "Invalid request. Dataset '{name}' misses the required comparison specification.".format(name=dataset.name))
 
     # generate an analysis id
-    analysis_id = str(uuid.uuid1())
+    analysis_id = str(uuid.uuid4())
 
     try:
         storage = ReactomeStorage()
 
-        # a very basic sanity check to make sure it's unique
-        while storage.analysis_exists(analysis_id):
-            analysis_id = str(uuid.uuid1())
-
         # Load request data from storage
-        for n_dataset in range(0, len(analysis_dict["datasets"])):
-            data = analysis_dict["datasets"][n_dataset]["data"]
+        for dataset_dict in analysis_dict["datasets"]:
+            data = dataset_dict["data"]
 
             # Update for external datasets
             if data[0:4] == "rqu_" or len(data) < 20:
-                # make sure the request data exists
-                if not storage.request_token_exists(data):
+                # load the data - missing data is returned as None
+                stored_data = storage.get_request_data(data)
+
+                if stored_data is None:
                     MISSING_DATA_TOKEN_COUNTER.inc()
                     abort(500, "No data available for storage token '{}'".format(data))
 
-                # load the data
-                stored_data = storage.get_request_data(data)
-
                 # if a bytes object is returned, this still has to be decoded
                 if type(stored_data) == bytes:
                     stored_data = stored_data.decode("UTF-8")
 
                 # update the request object
-                analysis_dict["datasets"][n_dataset]["data"] = stored_data
-
-        # Set the initial status
-        encoder = JSONEncoder()
+                dataset_dict["data"] = stored_data
 
+        # Set the initial status - this is only done if the analysis id
+        # is not used yet to make sure it's unique
         status = AnalysisStatus(id=analysis_id, status="running", completed=0, description="Queued")
-        storage.set_status(analysis_id, encoder.encode(status))
+
+        while not storage.set_status(analysis_id, encoder.dumps(status), nx=True):
+            analysis_id = str(uuid.uuid4())
+            status = AnalysisStatus(id=analysis_id, status="running", completed=0, description="Queued")
 
         # Save the request data
         analysis_dict["analysisId"] = analysis_id
-        storage.set_analysis_request_data(token=analysis_id, data=encoder.encode(analysis_dict))
+        storage.set_analysis_request_data(token=analysis_id, data=encoder.dumps(analysis_dict))
 
         try:
             # Submit the request to the queue
-            queue = ReactomeMQ()
+            # the connection is kept open for subsequent requests
+            queue = get_thread_mq()
             queue.post_analysis(AnalysisRequest(request_id=analysis_id).to_json(), analysis_request.method_name)
             LOGGER.debug("Analysis " + analysis_id + " submitted to queue")
-            queue.close()
 
-            STARTED_ANALYSIS_COUNTER.labels(client=user_client).inc()
+            STARTED_ANALYSIS_COUNTERS[user_client].inc()
 
             return analysis_id
         except socket.gaierror as e:
@@ -185,7 +187,7 @@ def start_analysis(body):  # noqa: E501
             LOGGER.error("Failed to connect to queuing system: " + str(e))
             status = AnalysisStatus(id=analysis_id, status="failed", completed=0,
                                     description="Failed to connect to queuing system.")
-            storage.set_status(analysis_id, encoder.encode(status))
+            storage.set_status(analysis_id, encoder.dumps(status))
 
             abort(503, "Failed to connect to queuing system. Please try again in a few seconds.")
         except ReactomeMQException as e:
@@ -193,7 +195,7 @@ def start_analysis(body):  # noqa: E501
             # update the status
             status = AnalysisStatus(id=analysis_id, status="failed", completed=0,
                                     description="Failed to connect to queuing system.")
-            storage.set_status(analysis_id, encoder.encode(status))
+            storage.set_status(analysis_id, encoder.dumps(status))
 
             abort(503, "The number of analysis requests is currently too high. Please try again in a few minutes.")
     except ReactomeStorageException as e:
@@ -1,29 +1,126 @@
+import io
 import logging
 import prometheus_client
 from flask import abort, Response, current_app
+import time
 import uuid
 import socket
-import json
+import orjson
 
-from reactome_analysis_api.encoder import JSONEncoder
+from reactome_analysis_api import encoder
 from reactome_analysis_api.models.dataset_loading_status import DatasetLoadingStatus  # noqa: E501
 from reactome_analysis_api.models.external_data import ExternalData  # noqa: E501
 from reactome_analysis_api import util
-from reactome_analysis_utils.reactome_mq import ReactomeMQ, ReactomeMQException, DATASET_QUEUE
+from reactome_analysis_utils.reactome_mq import get_thread_mq, ReactomeMQException, DATASET_QUEUE
 from reactome_analysis_utils.reactome_storage import ReactomeStorage, ReactomeStorageException
 from reactome_analysis_utils.models.dataset_request import DatasetRequest, DatasetRequestParameter
 from reactome_analysis_api.models.external_datasource import ExternalDatasource, ExternalDatasourceParameters
 from reactome_analysis_api.searcher.public_data_searcher import PublicDatasetSearcher
-from reactome_analysis_api.models import data_search_result
-from reactome_analysis_api.models import parameter
 
 LOGGER = logging.getLogger(__name__)
 DATASET_LOADING_COUNTER = prometheus_client.Counter("reactome_api_loading_datasets",
                                                     "External datasets loaded.", ["resource"])
 
+DATASET_LOADING_INPROGRESS_GAUGE = prometheus_client.Gauge("reactome_api_loading_datasets_inprogress",
+                                                           "Dataset loading requests currently being processed.",
+                                                           ["resource"])
+SLOW_DATASET_LOADING_COUNTER = prometheus_client.Counter("reactome_api_slow_loading_datasets",
+                                                         "Dataset loading requests that took longer than "
+                                                         "SLOW_LOADING_THRESHOLD.", ["resource"])
+
 DATASET_SEARCH_COUNTER = prometheus_client.Counter(
     "reactome_api_dataset_searches", "Number of searches performed.")
 
+SPECIES_CACHE_COUNTER = prometheus_client.Counter("reactome_api_species_cache",
+                                                  "Lookups of the encoded species list.", ["result"])
+SPECIES_CACHE_HITS = SPECIES_CACHE_COUNTER.labels(result="hit")
+SPECIES_CACHE_MISSES = SPECIES_CACHE_COUNTER.labels(result="miss")
+
+# maximum number of keywords used for a search
+MAX_SEARCH_TERMS = 20
+
+# dataset loading requests taking longer than this (in seconds) are counted as slow
+SLOW_LOADING_THRESHOLD = 1
+
+# JSON-encoded DatasetLoadingStatus objects set by load_data. The loading
+# ids are UUIDs and therefore never have to be escaped.
+_QUEUED_STATUS_TEMPLATE = '{{"id": "{}", "status": "running", "description": "Queued", "completed": 0}}'
+_FAILED_STATUS_TEMPLATE = '{{"id": "{}", "status": "failed", "description": "Failed to connect to queuing system.", ' \
+                          '"completed": 0}}'
+
+# the examples and data sources never change and are therefore only created and encoded once
+_EXAMPLES = (
+    ExternalData(id="EXAMPLE_MEL_RNA", title="Melanoma RNA-seq example", type="rnaseq_counts",
+                 description="RNA-seq analysis of melanoma associated B cells.",
+                 group="GRISS_MELANOMA"),
+    ExternalData(id="EXAMPLE_MEL_PROT", title="Melanoma proteomics example", type="proteomics_int",
+                 description="Quantitative (TMT-labelled) proteomics analysis of melanoma associated B cells.",
+                 group="GRISS_MELANOMA"),
+    ExternalData(id="EXAMPLE_SC_B_CELLS", title="B cell scRNAseq example", type="rnaseq_counts",
+                 description="Single-cell RNA-seq data of B cells extracted from the Jerby-Arnon at al. study (Cell 2018).",
+                 group="SC_EXAMPLES"),
+)
+
+_EXAMPLES_JSON = encoder.dumps(_EXAMPLES)
+
+_DATA_SOURCES = (
+    ExternalDatasource(id="example_datasets", name="Example datasets",
+                       description="Example datasets to quickly test the application.",
+                       url="https://reactome.org/gsa",
+                       parameters=[
+                           ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
+                                                        type="string", description="Identifier of the dataset",
+                                                        required=True)
+                       ]),
+    ExternalDatasource(id="ebi_gxa", name="Expression Atlas",
+                       description="EBI's Expression Atlas resource for consistently reprocessed 'omics data.",
+                       url="https://www.ebi.ac.uk/gxa/home",
+                       parameters=[
+                           ExternalDatasourceParameters(name="dataset_id", type="string", display_name="Dataset Id",
+                                                        description="Identifier of the dataset", required=True)
+                       ]),
+    ExternalDatasource(id="ebi_sc_gxa", name="Single Cell Expression Atlas",
+                       description="EBI's Single Cell Expression Atlas resource for consistently reprocessed scRNA-seq data.",
+                       url="https://www.ebi.ac.uk/gxa/sc/home",
+                       parameters=[
+                           ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
+                                                        type="string", description="Identifier of the dataset",
+                                                        required=True),
+                           ExternalDatasourceParameters(name="k", type="int", display_name="K",
+                                                        description="Parameter k used to create the cell clusters",
+                                                        required=True),
+                       ]),
+    ExternalDatasource(id="grein", name="GREIN Data",
+                       description="GREIN is an NCBI project that consistently reprocesses RNA-seq data from GEO.",
+                       url="http://www.ilincs.org/apps/grein/?gse=",
+                       parameters=[
+                           ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
+                                                        type="string", description="Identifier of the dataset",
+                                                        required=True)]),
+    ExternalDatasource(id="geo_microarray", name="GEO query",
+                       description="Uses 'GEO query' to load datasets directly from GEO. Primarily supports microarray data.",
+                       parameters=[
+                           ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
+                                                        type="string", description="Identifier of the dataset",
+                                                        required=True)])
+)
+
+_DATA_SOURCES_JSON = encoder.dumps(_DATA_SOURCES)
+
+# the JSON-encoded species list together with the list it was created from
+_SPECIES_JSON = (None, None)
+
+# the labelled loading metrics are only created for the known data sources, all other
+# (invalid) resource ids are counted as "other" to keep the number of series bounded
+_RESOURCE_LABELS = tuple(data_source.id for data_source in _DATA_SOURCES) + ("other", )
+
+DATASET_LOADING_COUNTERS = {resource: DATASET_LOADING_COUNTER.labels(resource=resource)
+                            for resource in _RESOURCE_LABELS}
+DATASET_LOADING_INPROGRESS_GAUGES = {resource: DATASET_LOADING_INPROGRESS_GAUGE.labels(resource=resource)
+                                     for resource in _RESOURCE_LABELS}
+SLOW_DATASET_LOADING_COUNTERS = {resource: SLOW_DATASET_LOADING_COUNTER.labels(resource=resource)
+                                 for resource in _RESOURCE_LABELS}
+
 
 def get_examples():  # noqa: E501
     """Lists the available example datasets
@@ -33,17 +130,7 @@ def get_examples():  # noqa: E501
 
     :rtype: ExternalData
     """
-    return [
-        ExternalData(id="EXAMPLE_MEL_RNA", title="Melanoma RNA-seq example", type="rnaseq_counts",
-                     description="RNA-seq analysis of melanoma associated B cells.",
-                     group="GRISS_MELANOMA"),
-        ExternalData(id="EXAMPLE_MEL_PROT", title="Melanoma proteomics example", type="proteomics_int",
-                     description="Quantitative (TMT-labelled) proteomics analysis of melanoma associated B cells.",
-                     group="GRISS_MELANOMA"),
-        ExternalData(id="EXAMPLE_SC_B_CELLS", title="B cell scRNAseq example", type="rnaseq_counts",
-                     description="Single-cell RNA-seq data of B cells extracted from the Jerby-Arnon at al. study (Cell 2018).",
-                     group="SC_EXAMPLES"),
-    ]
+    return Response(_EXAMPLES_JSON, mimetype="application/json")
 
 
 def get_data_sources():  # noqa: E501
@@ -54,56 +141,18 @@ def get_data_sources():  # noqa: E501
 
     :rtype: ExternalDatasource
     """
-    return [
-        ExternalDatasource(id="example_datasets", name="Example datasets",
-                           description="Example datasets to quickly test the application.",
-                           url="https://reactome.org/gsa",
-                           parameters=[
-                               ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
-                                                            type="string", description="Identifier of the dataset",
-                                                            required=True)
-                           ]),
-        ExternalDatasource(id="ebi_gxa", name="Expression Atlas",
-                           description="EBI's Expression Atlas resource for consistently reprocessed 'omics data.",
-                           url="https://www.ebi.ac.uk/gxa/home",
-                           parameters=[
-                               ExternalDatasourceParameters(name="dataset_id", type="string", display_name="Dataset Id",
-                                                            description="Identifier of the dataset", required=True)
-                           ]),
-        ExternalDatasource(id="ebi_sc_gxa", name="Single Cell Expression Atlas",
-                           description="EBI's Single Cell Expression Atlas resource for consistently reprocessed scRNA-seq data.",
-                           url="https://www.ebi.ac.uk/gxa/sc/home",
-                           parameters=[
-                               ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
-                                                            type="string", description="Identifier of the dataset",
-                                                            required=True),
-                               ExternalDatasourceParameters(name="k", type="int", display_name="K",
-                                                            description="Parameter k used to create the cell clusters",
-                                                            required=True),
-                           ]),
-        ExternalDatasource(id="grein", name="GREIN Data",
-                           description="GREIN is an NCBI project that consistently reprocesses RNA-seq data from GEO.",
-                           url="http://www.ilincs.org/apps/grein/?gse=",
-                           parameters=[
-                               ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
-                                                            type="string", description="Identifier of the dataset",
-                                                            required=True)]),
-        ExternalDatasource(id="geo_microarray", name="GEO query",
-                           description="Uses 'GEO query' to load datasets directly from GEO. Primarily supports microarray data.",
-                           parameters=[
-                               ExternalDatasourceParameters(name="dataset_id", display_name="Dataset Id",
-                                                            type="string", description="Identifier of the dataset",
-                                                            required=True)])
-    ]
-
-
-def get_data_loading_status(loadingId):  # noqa: E501
+    return Response(_DATA_SOURCES_JSON, mimetype="application/json")
+
+
+def get_data_loading_status(loadingId, wait=0):  # noqa: E501
     """Retrieves the status for the dataset loading process.
 
      # noqa: E501
 
     :param loadingId: The loading identifier returned by &#39;/data/load&#39;
     :type loadingId: str
+    :param wait: If set, a running process' status is only returned once it changes or after this many seconds
+    :type wait: int
 
     :rtype: DatasetLoadingStatus
     """
@@ -118,6 +167,9 @@ def get_data_loading_status(loadingId):  # noqa: E501
                 "Unknown identifier passed to get_status: " + loadingId)
             abort(404, "Unknown identifier")
         else:
+            if wait > 0 and orjson.loads(status)["status"] == "running":
+                status = storage.wait_for_status_update(loadingId, status, data_type="dataset", timeout=wait)
+
             # return a Response object to prevent connexion from
             # de-serializing the object into a JSON object
             return Response(response=status, status=200, headers={"content-type": "application/json"})
@@ -140,9 +192,7 @@ def get_summary(datasetId):  # noqa: E501
     try:
         storage = ReactomeStorage()
 
-        if not storage.request_data_summary_exists(datasetId):
-            abort(404, "Unknown identifier passed.")
-
+        # missing summaries are returned as None
         summary_data = storage.get_request_data_summary(datasetId)
 
         if summary_data is not None:
@@ -167,18 +217,35 @@ def load_data(resourceId, parameters):  # noqa: E501
 
     :rtype: str
     """
+    resource = resourceId if resourceId in DATASET_LOADING_COUNTERS else "other"
+    start = time.perf_counter()
+
+    try:
+        with DATASET_LOADING_INPROGRESS_GAUGES[resource].track_inprogress():
+            return _load_data(resourceId, parameters, resource)
+    finally:
+        if time.perf_counter() - start > SLOW_LOADING_THRESHOLD:
+            SLOW_DATASET_LOADING_COUNTERS[resource].inc()
+
+
+def _load_data(resourceId: str, parameters: list, resource: str) -> str:
+    """
+    Submits the dataset loading request. This function is only called by load_data.
+    :param resourceId: The identifier of the data source to load from
+    :param parameters: The parameters for the selected resource.
+    :param resource: The resource label used for the metrics
+    :return: The loading id
+    """
     try:
         storage = ReactomeStorage()
 
         # generate an id for the request
-        loading_id = str(uuid.uuid1())
+        loading_id = str(uuid.uuid4())
 
-        # Set the initial status
-        encoder = JSONEncoder()
-        status = DatasetLoadingStatus(
-            id=loading_id, status="running", completed=0, description="Queued")
-        storage.set_status(loading_id, encoder.encode(
-            status), data_type="dataset")
+        # Set the initial status - this is only done if the loading id
+        # is not used yet to make sure it's unique
+        while not storage.set_status(loading_id, _QUEUED_STATUS_TEMPLATE.format(loading_id), data_type="dataset", nx=True):
+            loading_id = str(uuid.uuid4())
 
         # convert the parameters
         request_parameters = list()
@@ -192,33 +259,27 @@ def load_data(resourceId, parameters):  # noqa: E501
             loading_id=loading_id, resource_id=resourceId, parameters=request_parameters)
 
         try:
-            queue = ReactomeMQ(queue_name=DATASET_QUEUE)
+            # the connection is kept open for subsequent requests
+            queue = get_thread_mq(queue_name=DATASET_QUEUE)
             queue.post_analysis(analysis=request.to_json(),
                                 method="DatasetLoading")
             LOGGER.debug("Dataset process " +
                          loading_id + " submitted to queue")
-            queue.close()
 
-            DATASET_LOADING_COUNTER.labels(resource=resourceId).inc()
+            DATASET_LOADING_COUNTERS[resource].inc()
 
             return loading_id
         except socket.gaierror as e:
             # update the status
             LOGGER.error("Failed to connect to queuing system: " + str(e))
-            status = DatasetLoadingStatus(id=loading_id, status="failed", completed=0,
-                                          description="Failed to connect to queuing system.")
-            storage.set_status(loading_id, encoder.encode(
-                status), data_type="dataset")
+            storage.set_status(loading_id, _FAILED_STATUS_TEMPLATE.format(loading_id), data_type="dataset")
 
             abort(
                 503, "Failed to connect to queuing system. Please try again in a few seconds.")
         except ReactomeMQException as e:
             LOGGER.error("Failed to post message to queuing system: " + str(e))
             # update the status
-            status = DatasetLoadingStatus(id=loading_id, status="failed", completed=0,
-                                          description="Failed to connect to queuing system.")
-            storage.set_status(loading_id, encoder.encode(
-                status), data_type="dataset")
+            storage.set_status(loading_id, _FAILED_STATUS_TEMPLATE.format(loading_id), data_type="dataset")
 
             abort(
                 503, "The number of analysis requests is currently too high. Please try again in a few minutes.")
@@ -231,6 +292,33 @@ def load_data(resourceId, parameters):  # noqa: E501
             "Socket timeout connecting to storage or queuing system: " + str(e))
         abort(503, "Failed to connect to downstream system. Please try again in a few minutes.")
 
+def _unescape_chunks(chunks):
+    """Fixes the special character encoding issue of stored datasets by
+    replacing escaped newline and tab characters in the passed chunks.
+
+    :param chunks: The dataset's chunks as bytes
+    :return: A generator returning the fixed chunks
+    """
+    remainder = b""
+
+    for chunk in chunks:
+        chunk = remainder + chunk
+        remainder = b""
+
+        # a trailing backslash may escape the next chunk's first character
+        if chunk.endswith(b"\\"):
+            remainder = b"\\"
+            chunk = chunk[:-1]
+
+        # the replacements are skipped if the chunk contains no escaped characters
+        if b"\\" in chunk:
+            chunk = chunk.replace(b"\\n", b"\n")
+            chunk = chunk.replace(b"\\t", b"\t")
+
+        yield chunk
+
+    yield remainder
+
 def download_dataset(datasetId, format = None):
     """Download a previously loaded dataset
 
@@ -250,35 +338,38 @@ def download_dataset(datasetId, format = None):
         if format == "meta":
             summary = storage.get_request_data_summary(token=datasetId)
 
+            # missing summaries are returned as None
+            if summary is None:
+                abort(404, "Unknown identifier passed.")
+
             # convert to TSV
-            summary = json.loads(summary)
+            summary = orjson.loads(summary)
 
-            tsv_string = []
+            # get the fields' values only once
+            field_values = [field["values"] for field in summary["sample_metadata"]]
+
+            tsv_string = io.StringIO()
 
             # first column is the samples
-            header_string = "Sample Id\t"
-            header_string += "\t".join( [field["name"] for field in summary["sample_metadata"]] )
-            tsv_string.append(header_string)
+            tsv_string.write("Sample Id\t")
+            tsv_string.write("\t".join( [field["name"] for field in summary["sample_metadata"]] ))
 
             # add the field data
             for index, sample in enumerate(summary["sample_ids"]):
-                sample_string = sample + "\t"
+                tsv_string.write("\n" + sample + "\t")
 
                 # add the fields
-                sample_string += "\t".join( [str(field["values"][index]) for field in summary["sample_metadata"]] )
-
-                tsv_string.append(sample_string)
+                tsv_string.write("\t".join( [str(values[index]) for values in field_values] ))
 
-            return Response(response="\n".join(tsv_string), status=200, headers={"content-type": "text/plain", 
+            return Response(response=tsv_string.getvalue(), status=200, headers={"content-type": "text/plain", 
                                                                       "content-disposition": f"attachment; filename=\"{datasetId}_meta.tsv\""})
         elif format == "expr":
-            expression_data = storage.get_request_data(token=datasetId)
+            expression_chunks = storage.get_request_data_chunks(token=datasetId)
 
-            # fix special character encoding issue
-            expression_data = expression_data.replace("\\n", "\n")
-            expression_data = expression_data.replace("\\t", "\t")
+            if expression_chunks is None:
+                abort(404, "Failed to retrieve dataset. Make sure the dataset was successfully loaded beforehand.")
 
-            return Response(response=expression_data, status=200, headers={"content-type": "text/plain", 
+            return Response(response=_unescape_chunks(expression_chunks), status=200, headers={"content-type": "text/plain", 
                                                                       "content-disposition": f"attachment; filename=\"{datasetId}_expr.tsv\""})
         else:
             abort(404, "Unsupported format passed.")
@@ -291,9 +382,18 @@ def get_search_species():  # noqa: E501
     :rtype: list
     """
     try:
+        global _SPECIES_JSON
+
         species_list = current_app.public_searcher.get_species()
 
-        return species_list
+        # the searcher only loads the species once, the cached JSON is updated if it was reloaded
+        if _SPECIES_JSON[0] is not species_list:
+            SPECIES_CACHE_MISSES.inc()
+            _SPECIES_JSON = (species_list, orjson.dumps(species_list))
+        else:
+            SPECIES_CACHE_HITS.inc()
+
+        return Response(_SPECIES_JSON[1], mimetype="application/json")
     except FileNotFoundError as e:
         LOGGER.error(f"Loading species failed.")
 
@@ -309,9 +409,15 @@ def search_data(keywords, species=None):  # noqa: E501
     :param species: If set, only samples for this species are being returned.
     :type species: string
     """
+    # normalize the keywords - duplicates are removed since all keywords must match anyway
+    search_terms = list(dict.fromkeys(keywords.lower().split()))[:MAX_SEARCH_TERMS]
+
+    if len(search_terms) < 1:
+        abort(400, "No search keywords specified.")
+
     try:
         search_response = current_app.public_searcher.index_search(
-            keywords.split(" "), species)
+            search_terms, species)
     except Exception as e:
         LOGGER.error(f"Search failed: {keywords}")
         LOGGER.exception(e)
@@ -319,26 +425,18 @@ def search_data(keywords, species=None):  # noqa: E501
 
     DATASET_SEARCH_COUNTER.inc()
 
-    # convert to a list of search result objects
-    search_response_list = list()
-
-    for search_result in search_response:
-        # convert the loading parameters
-        loading_parameters = list()
-
-        original_parameters = json.loads(search_result["loading_parameters"])
-        for param_name in original_parameters.keys():
-            loading_parameters.append(parameter.Parameter(name=param_name, value=original_parameters[param_name]))
-
-        # create the search result object
-        search_response_result = data_search_result.DataSearchResult(id=search_result["id"],
-                                                                     title=search_result["title"],
-                                                                     description=search_result["description"],
-                                                                     species=search_result["species"],
-                                                                     resource_name=search_result["data_source"],
-                                                                     resource_loading_id=search_result["resource_id"], 
-                                                                     loading_parameters=loading_parameters,
-                                                                     web_link=search_result["web_link"])
-        search_response_list.append(search_response_result)
-
-    return search_response_list
+    # the results are returned as DataSearchResult objects - these are created as dicts
+    # directly since they are only serialized to JSON
+    search_response_list = [{
+        "id": search_result["id"],
+        "title": search_result["title"],
+        "description": search_result["description"],
+        "species": search_result["species"],
+        "resource_name": search_result["data_source"],
+        "resource_loading_id": search_result["resource_id"],
+        "loading_parameters": [{"name": param_name, "value": param_value} for param_name, param_value
+                               in orjson.loads(search_result["loading_parameters"]).items()],
+        "web_link": search_result["web_link"]
+    } for search_result in search_response]
+
+    return Response(orjson.dumps(search_response_list), mimetype="application/json")
@@ -1,11 +1,21 @@
 import logging
 
+import orjson
 from flask import abort, Response
 from reactome_analysis_api.models.analysis_result import AnalysisResult  # noqa: E501
 from reactome_analysis_utils.reactome_storage import ReactomeStorage, ReactomeStorageException
 
 LOGGER = logging.getLogger(__name__)
 
+# the storage data type and response headers for each supported result extension
+_RESULT_FORMATS = {
+    "": ("analysis", {"content-type": "application/json"}),
+    "xlsx": ("report", {"content-type": "application/xlsx"}),
+    "pdf": ("pdf_report", {"content-type": "application/pdf"}),
+    "r": ("r_script", {"content-type": "text/plain",
+                       "content-disposition": "attachment; filename=\"ReactomeGSA_analysis_script.R\""})
+}
+
 
 def get_result(analysisId):  # noqa: E501
     """Retrieves the result for the completed analysis task
@@ -19,35 +29,22 @@ def get_result(analysisId):  # noqa: E501
     """
     try:
         # check if an extension was present
-        extension = None
-
-        if "." in analysisId:
-            extension = analysisId[analysisId.find(".") + 1:]
-            analysisId = analysisId[:analysisId.find(".")]
+        analysisId, separator, extension = analysisId.partition(".")
 
-        storage = ReactomeStorage()
+        result_format = _RESULT_FORMATS.get(extension)
 
-        if extension == "xlsx":
-            xlsx_file = storage.get_result(analysis_identifier=analysisId, data_type="report")
+        if result_format is None:
+            abort(404, "Unknown result format '{}' requested.".format(extension))
 
-            if xlsx_file is not None:
-                return Response(response=xlsx_file, status=200, headers={"content-type": "application/xlsx"})
-        elif extension == "pdf":
-            pdf_file = storage.get_result(analysis_identifier=analysisId, data_type="pdf_report")
+        data_type, headers = result_format
 
-            if pdf_file is not None:
-                return Response(response=pdf_file, status=200, headers={"content-type": "application/pdf"})
-        elif extension == "r":
-            r_file = storage.get_result(analysis_identifier=analysisId, data_type="r_script")
+        storage = ReactomeStorage()
 
-            if r_file is not None:
-                return Response(response=r_file, status=200, headers={"content-type": "text/plain", 
-                                                                      "content-disposition": "attachment; filename=\"ReactomeGSA_analysis_script.R\""})
-        else:
-            result = storage.get_result(analysisId)
+        # the results are streamed from storage in chunks
+        result = storage.get_result_chunks(analysis_identifier=analysisId, data_type=data_type)
 
-            if result is not None:
-                return Response(response=result, status=200, headers={"content-type": "application/json"})
+        if result is not None:
+            return Response(response=result, status=200, headers=headers)
 
         # find out why the result doesn't exist
         status = storage.get_status(analysisId)
@@ -63,13 +60,15 @@ def get_result(analysisId):  # noqa: E501
         abort(503, "Failed to connect to storage system. Please try again in a few minutes.")
 
 
-def get_status(analysisId):  # noqa: E501
+def get_status(analysisId, wait=0):  # noqa: E501
     """Retrieves the status for the specified analysis.
 
      # noqa: E501
 
     :param analysisId: The analysis identifier returned by &#39;/analysis&#39;
     :type analysisId: str
+    :param wait: If set, a running analysis' status is only returned once it changes or after this many seconds
+    :type wait: int
 
     :rtype: InlineResponse200
     """
@@ -82,6 +81,9 @@ def get_status(analysisId):  # noqa: E501
             LOGGER.debug("Unknown identifier passed to get_status: " + analysisId)
             abort(404, "Unknown identifier")
         else:
+            if wait > 0 and orjson.loads(status)["status"] == "running":
+                status = storage.wait_for_status_update(analysisId, status, timeout=wait)
+
             # return a Response object to prevent connexion from
             # de-serializing the object into a JSON object
             return Response(response=status, status=200, headers={"content-type": "application/json"})
@@ -1,20 +1,66 @@
 from connexion.apps.flask_app import FlaskJSONEncoder
-import six
+import orjson
 
 from reactome_analysis_api.models.base_model_ import Model
 
 
+def model_to_dict(o: Model, include_nulls: bool = False) -> dict:
+    """
+    Converts a swagger model into a dict using the models' attribute names.
+    Nested models are not converted.
+    :param o: The model to convert
+    :param include_nulls: If set, attributes set to None are included
+    :return: The model as a dict
+    """
+    dikt = {}
+    # the values are read from the attributes behind the properties directly
+    for attr, json_key in o.attribute_map.items():
+        value = getattr(o, "_" + attr, None)
+        if value is None and not include_nulls:
+            continue
+        dikt[json_key] = value
+    return dikt
+
+
+def _orjson_default(o):
+    if isinstance(o, Model):
+        return model_to_dict(o, include_nulls=JSONEncoder.include_nulls)
+    raise TypeError("Object of type {} is not JSON serializable".format(type(o).__name__))
+
+
+def dumps(o) -> bytes:
+    """
+    Serializes the object to JSON using orjson. Swagger models are
+    converted in the same way as by the JSONEncoder.
+    :param o: The object to serialize
+    :return: The JSON encoded object as bytes
+    """
+    return orjson.dumps(o, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
 class JSONEncoder(FlaskJSONEncoder):
     include_nulls = False
 
+    def encode(self, o):
+        """
+        Encodes the object using orjson. Objects that are not supported by orjson
+        are encoded using the default JSONEncoder.
+        :param o: The object to encode
+        :return: The JSON string
+        """
+        option = orjson.OPT_NON_STR_KEYS
+
+        if self.indent:
+            option |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+
+        try:
+            return orjson.dumps(o, default=self.default, option=option).decode("utf-8")
+        except TypeError:
+            return FlaskJSONEncoder.encode(self, o)
+
     def default(self, o):
         if isinstance(o, Model):
-            dikt = {}
-            for attr, _ in six.iteritems(o.swagger_types):
-                value = getattr(o, attr)
-                if value is None and not self.include_nulls:
-                    continue
-                attr = o.attribute_map[attr]
-                dikt[attr] = value
-            return dikt
+            return model_to_dict(o, include_nulls=self.include_nulls)
         return FlaskJSONEncoder.default(self, o)
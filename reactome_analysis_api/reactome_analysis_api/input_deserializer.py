@@ -1,11 +1,13 @@
 import logging
-from copy import deepcopy
 
 from reactome_analysis_api import methods
 from reactome_analysis_api.models.analysis_input import AnalysisInput
 
 LOGGER = logging.getLogger(__name__)
 
+# properties of the design that are supported by the swagger model
+_KNOWN_DESIGN_PROPERTIES = frozenset(["samples", "comparison", "analysisGroup"])
+
 
 def create_analysis_input_object(input_dict: dict) -> AnalysisInput:
     """
@@ -27,58 +29,55 @@ def create_analysis_input_object(input_dict: dict) -> AnalysisInput:
 
     input_object = AnalysisInput.from_dict(input_dict)
 
-    # convert the request parameters to a dict
+    # get the default values of all parameters
+    default_parameters = methods.get_default_parameters(method_name=input_object.method_name)
+
+    if not default_parameters:
+        raise Exception("Unknown analysis method '{}' selected".format(input_object.method_name))
+
+    default_values, dataset_parameter_names = default_parameters
+
+    # start with the default values and overwrite them with the request parameters
     LOGGER.debug("Existing user parameters:")
-    params = dict()
-    object_params = getattr(input_object, "parameters", list())
+    params = default_values.copy()
+    object_params = getattr(input_object, "parameters", None)
     if object_params:
         for parameter in object_params:
-            LOGGER.debug(parameter.name + " = " + parameter.value)
+            LOGGER.debug("%s = %s", parameter.name, parameter.value)
             params[parameter.name] = parameter.value
 
-    # set all non-existing parameters to their default value
-    method_parameters = methods.get_parameters_for_method(method_name=input_object.method_name)
-
-    if not method_parameters:
-        raise Exception("Unknown analysis method '{}' selected".format(input_object.method_name))
-
-    for parameter in method_parameters:
-        if parameter.name not in params:
-            params[parameter.name] = parameter.default
-
     input_object.parameter_dict = params
 
-    # get the names of all dataset-level parameters
-    dataset_parameter_names = set([parameter.name for parameter in method_parameters if parameter.scope == "dataset"])
-
     # get the current (default) values for all dataset-level parameters
-    dataset_default_parameters = dict([(name, value) for (name, value) in input_object.parameter_dict.items()
-                                       if name in dataset_parameter_names])
+    dataset_default_parameters = {name: params[name] for name in dataset_parameter_names}
 
     # adapt every dataset
-    for i in range(0, len(input_object.datasets)):
-        existing_dataset_parameters = getattr(input_object.datasets[i], "parameters", list())
-        # start with a copy of the default parameters
-        dataset_parameter_dict = deepcopy(dataset_default_parameters)
+    for dataset, dataset_dict in zip(input_object.datasets, input_dict["datasets"]):
+        existing_dataset_parameters = getattr(dataset, "parameters", None)
+        # start with a copy of the default parameters - a shallow copy is sufficient since
+        # all parameter values are strings
+        dataset_parameter_dict = dataset_default_parameters.copy()
 
         # if dataset level parameters are present, they overwrite the analysis wide ones
         if existing_dataset_parameters:
             for existing_parameter in existing_dataset_parameters:
                 dataset_parameter_dict[existing_parameter.name] = existing_parameter.value
 
-        input_object.datasets[i].parameter_dict = dataset_parameter_dict
+        dataset.parameter_dict = dataset_parameter_dict
+
+        # fix the additional property issue in swagger
+        design_dict = dataset_dict.get("design")
 
-    # fix the additional property issue in swagger
-    for i in range(0, len(input_object.datasets)):
         # ignore datasets without design
-        if "design" not in input_dict["datasets"][i]:
+        if not design_dict:
             continue
 
-        for property in input_dict["datasets"][i]["design"]:
-            if property not in ["samples", "comparison", "analysisGroup"]:
-                if not hasattr(input_object.datasets[i].design, "additional_properties"):
-                    input_object.datasets[i].design.additional_properties = dict()
-                input_object.datasets[i].design.additional_properties[property] = \
-                    input_dict["datasets"][i]["design"][property]
+        additional_properties = {name: value for name, value in design_dict.items()
+                                 if name not in _KNOWN_DESIGN_PROPERTIES}
+
+        if additional_properties:
+            if getattr(dataset.design, "additional_properties", None) is None:
+                dataset.design.additional_properties = dict()
+            dataset.design.additional_properties.update(additional_properties)
 
     return input_object
\ No newline at end of file
@@ -139,13 +139,14 @@ available_methods = [
 ]
 
 
-def get_available_methods():
+def _create_methods_with_globals():
     """
-    Returns all available methods with the global parameters added
-    to each method's parameters.
+    Creates a copy of all available methods with the global parameters
+    added to each method's parameters.
     :return: A list of Methods
     """
-    methods = copy.deepcopy(available_methods)
+    # a shallow copy is sufficient since only the parameter list is replaced
+    methods = [copy.copy(method) for method in available_methods]
 
     # add the global parameters to all methods (first)
     for method in methods:
@@ -154,19 +155,48 @@ def get_available_methods():
     return methods
 
 
-def get_parameters_for_method(method_name: str) -> list():
+# the methods never change and are therefore only created once
+_METHODS_WITH_GLOBALS = _create_methods_with_globals()
+
+def _create_default_parameters(method_parameters: list) -> tuple:
     """
-    Returns a list of parameters defined for the specified method. Returns None if
-    no method with that name exists.
-    :param method_name: The method's name (case-insensitive)
-    :return: A list of MethodParameters
+    Creates the default values of all parameters and the names of the dataset-level
+    parameters for a method.
+    :param method_parameters: The method's parameters
+    :return: A tuple of the default values as a dict and the dataset-level parameter names
     """
-    method_name = method_name.lower().strip()
+    default_values = dict()
+
+    # if a parameter is defined more than once, the first definition is used
+    for parameter in method_parameters:
+        default_values.setdefault(parameter.name, parameter.default)
+
+    dataset_parameter_names = tuple(parameter.name for parameter in method_parameters if parameter.scope == "dataset")
+
+    return default_values, dataset_parameter_names
+
+
+# the default parameters indexed by the lower case method name
+_DEFAULT_PARAMETERS_BY_METHOD_NAME = {method.name.lower(): _create_default_parameters(method.parameters)
+                                      for method in _METHODS_WITH_GLOBALS}
 
-    all_methods = get_available_methods()
 
-    for method in all_methods:
-        if method.name.lower() == method_name:
-            return method.parameters
+def get_available_methods():
+    """
+    Returns all available methods with the global parameters added
+    to each method's parameters. The returned list is shared and must
+    not be modified.
+    :return: A list of Methods
+    """
+    return _METHODS_WITH_GLOBALS
 
-    return None
+
+def get_default_parameters(method_name: str) -> tuple:
+    """
+    Returns the default values of all parameters and the names of the dataset-level
+    parameters for the specified method. Returns None if no method with that name
+    exists. The returned objects are shared and must not be modified.
+    :param method_name: The method's name (case-insensitive)
+    :return: A tuple of the default values as a dict and the dataset-level parameter names
+    """
+    return _DEFAULT_PARAMETERS_BY_METHOD_NAME.get(method_name.lower().strip())
@@ -17,6 +17,23 @@ class AnalysisInput(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'method_name': str,
+        'datasets': List[Dataset],
+        'parameters': List[Parameter],
+        'analysis_id': str
+    }
+
+    attribute_map = {
+        'method_name': 'methodName',
+        'datasets': 'datasets',
+        'parameters': 'parameters',
+        'analysis_id': 'analysisId'
+    }
+
+    # parameter_dict is added by the input_deserializer
+    __slots__ = ('_method_name', '_datasets', '_parameters', '_analysis_id', 'parameter_dict')
+
     def __init__(self, method_name: str=None, datasets: List[Dataset]=None, parameters: List[Parameter]=None, analysis_id: str=None):  # noqa: E501
         """AnalysisInput - a model defined in Swagger
 
@@ -29,20 +46,6 @@ class AnalysisInput(Model):
         :param analysis_id: The analysis_id of this AnalysisInput.  # noqa: E501
         :type analysis_id: str
         """
-        self.swagger_types = {
-            'method_name': str,
-            'datasets': List[Dataset],
-            'parameters': List[Parameter],
-            'analysis_id': str
-        }
-
-        self.attribute_map = {
-            'method_name': 'methodName',
-            'datasets': 'datasets',
-            'parameters': 'parameters',
-            'analysis_id': 'analysisId'
-        }
-
         self._method_name = method_name
         self._datasets = datasets
         self._parameters = parameters
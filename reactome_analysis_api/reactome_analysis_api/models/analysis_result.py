@@ -18,6 +18,24 @@ class AnalysisResult(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'release': str,
+        'method_name': str,
+        'results': List[AnalysisResultResults],
+        'reactome_links': List[AnalysisResultReactomeLinks],
+        'mappings': List[AnalysisResultMappings]
+    }
+
+    attribute_map = {
+        'release': 'release',
+        'method_name': 'methodName',
+        'results': 'results',
+        'reactome_links': 'reactome_links',
+        'mappings': 'mappings'
+    }
+
+    __slots__ = ('_release', '_method_name', '_results', '_reactome_links', '_mappings')
+
     def __init__(self, release: str=None, method_name: str=None, results: List[AnalysisResultResults]=None, reactome_links: List[AnalysisResultReactomeLinks]=None, mappings: List[AnalysisResultMappings]=None):  # noqa: E501
         """AnalysisResult - a model defined in Swagger
 
@@ -32,22 +50,6 @@ class AnalysisResult(Model):
         :param mappings: The mappings of this AnalysisResult.  # noqa: E501
         :type mappings: List[AnalysisResultMappings]
         """
-        self.swagger_types = {
-            'release': str,
-            'method_name': str,
-            'results': List[AnalysisResultResults],
-            'reactome_links': List[AnalysisResultReactomeLinks],
-            'mappings': List[AnalysisResultMappings]
-        }
-
-        self.attribute_map = {
-            'release': 'release',
-            'method_name': 'methodName',
-            'results': 'results',
-            'reactome_links': 'reactome_links',
-            'mappings': 'mappings'
-        }
-
         self._release = release
         self._method_name = method_name
         self._results = results
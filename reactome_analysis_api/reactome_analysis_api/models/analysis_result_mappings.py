@@ -15,6 +15,18 @@ class AnalysisResultMappings(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'identifier': str,
+        'mapped_to': List[str]
+    }
+
+    attribute_map = {
+        'identifier': 'identifier',
+        'mapped_to': 'mapped_to'
+    }
+
+    __slots__ = ('_identifier', '_mapped_to')
+
     def __init__(self, identifier: str=None, mapped_to: List[str]=None):  # noqa: E501
         """AnalysisResultMappings - a model defined in Swagger
 
@@ -23,16 +35,6 @@ class AnalysisResultMappings(Model):
         :param mapped_to: The mapped_to of this AnalysisResultMappings.  # noqa: E501
         :type mapped_to: List[str]
         """
-        self.swagger_types = {
-            'identifier': str,
-            'mapped_to': List[str]
-        }
-
-        self.attribute_map = {
-            'identifier': 'identifier',
-            'mapped_to': 'mapped_to'
-        }
-
         self._identifier = identifier
         self._mapped_to = mapped_to
 
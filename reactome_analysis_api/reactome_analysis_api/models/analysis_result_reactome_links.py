@@ -15,6 +15,22 @@ class AnalysisResultReactomeLinks(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'url': str,
+        'name': str,
+        'token': str,
+        'description': str
+    }
+
+    attribute_map = {
+        'url': 'url',
+        'name': 'name',
+        'token': 'token',
+        'description': 'description'
+    }
+
+    __slots__ = ('_url', '_name', '_token', '_description')
+
     def __init__(self, url: str=None, name: str=None, token: str=None, description: str=None):  # noqa: E501
         """AnalysisResultReactomeLinks - a model defined in Swagger
 
@@ -27,20 +43,6 @@ class AnalysisResultReactomeLinks(Model):
         :param description: The description of this AnalysisResultReactomeLinks.  # noqa: E501
         :type description: str
         """
-        self.swagger_types = {
-            'url': str,
-            'name': str,
-            'token': str,
-            'description': str
-        }
-
-        self.attribute_map = {
-            'url': 'url',
-            'name': 'name',
-            'token': 'token',
-            'description': 'description'
-        }
-
         self._url = url
         self._name = name
         self._token = token
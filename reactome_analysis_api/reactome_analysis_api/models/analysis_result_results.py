@@ -15,6 +15,20 @@ class AnalysisResultResults(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'pathways': str,
+        'fold_changes': str
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'pathways': 'pathways',
+        'fold_changes': 'fold_changes'
+    }
+
+    __slots__ = ('_name', '_pathways', '_fold_changes')
+
     def __init__(self, name: str=None, pathways: str=None, fold_changes: str=None):  # noqa: E501
         """AnalysisResultResults - a model defined in Swagger
 
@@ -25,18 +39,6 @@ class AnalysisResultResults(Model):
         :param fold_changes: The fold_changes of this AnalysisResultResults.  # noqa: E501
         :type fold_changes: str
         """
-        self.swagger_types = {
-            'name': str,
-            'pathways': str,
-            'fold_changes': str
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'pathways': 'pathways',
-            'fold_changes': 'fold_changes'
-        }
-
         self._name = name
         self._pathways = pathways
         self._fold_changes = fold_changes
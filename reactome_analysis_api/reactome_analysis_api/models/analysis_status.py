@@ -15,6 +15,22 @@ class AnalysisStatus(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'status': str,
+        'description': str,
+        'completed': float
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'status': 'status',
+        'description': 'description',
+        'completed': 'completed'
+    }
+
+    __slots__ = ('_id', '_status', '_description', '_completed')
+
     def __init__(self, id: str=None, status: str=None, description: str=None, completed: float=None):  # noqa: E501
         """AnalysisStatus - a model defined in Swagger
 
@@ -27,20 +43,6 @@ class AnalysisStatus(Model):
         :param completed: The completed of this AnalysisStatus.  # noqa: E501
         :type completed: float
         """
-        self.swagger_types = {
-            'id': str,
-            'status': str,
-            'description': str,
-            'completed': float
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'status': 'status',
-            'description': 'description',
-            'completed': 'completed'
-        }
-
         self._id = id
         self._status = status
         self._description = description
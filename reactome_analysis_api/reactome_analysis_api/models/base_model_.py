@@ -9,6 +9,9 @@ T = typing.TypeVar('T')
 
 
 class Model(object):
+    # the models' attributes are stored in __slots__ defined by every subclass
+    __slots__ = ()
+
     # swaggerTypes: The key is attribute name and the
     # value is attribute type.
     swagger_types = {}
@@ -62,7 +65,7 @@ class Model(object):
 
     def __eq__(self, other):
         """Returns true if both objects are equal"""
-        return self.__dict__ == other.__dict__
+        return all(getattr(self, slot, None) == getattr(other, slot, None) for slot in self.__slots__)
 
     def __ne__(self, other):
         """Returns true if both objects are not equal"""
@@ -16,6 +16,31 @@ class DataSearchResult(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'title': str,
+        'description': str,
+        'species': str,
+        'resource_name': str,
+        'resource_loading_id': str,
+        'loading_parameters': List[Parameter],
+        'web_link': str
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'species': 'species',
+        'resource_name': 'resource_name',
+        'resource_loading_id': 'resource_loading_id',
+        'loading_parameters': 'loading_parameters',
+        'web_link': 'web_link'
+    }
+
+    __slots__ = ('_id', '_title', '_description', '_species', '_resource_name', '_resource_loading_id',
+                 '_loading_parameters', '_web_link')
+
     def __init__(self, id: str=None, title: str=None, description: str=None, species: str=None, resource_name: str=None, resource_loading_id: str=None, loading_parameters: List[Parameter]=None, web_link: str=None):  # noqa: E501
         """DataSearchResult - a model defined in Swagger
 
@@ -36,28 +61,6 @@ class DataSearchResult(Model):
         :param web_link: The web_link of this DataSearchResult.  # noqa: E501
         :type web_link: str
         """
-        self.swagger_types = {
-            'id': str,
-            'title': str,
-            'description': str,
-            'species': str,
-            'resource_name': str,
-            'resource_loading_id': str,
-            'loading_parameters': List[Parameter],
-            'web_link': str
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'title': 'title',
-            'description': 'description',
-            'species': 'species',
-            'resource_name': 'resource_name',
-            'resource_loading_id': 'resource_loading_id',
-            'loading_parameters': 'loading_parameters',
-            'web_link': 'web_link'
-        }
-
         self._id = id
         self._title = title
         self._description = description
@@ -15,6 +15,20 @@ class DataType(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'name': str,
+        'description': str
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description'
+    }
+
+    __slots__ = ('_id', '_name', '_description')
+
     def __init__(self, id: str=None, name: str=None, description: str=None):  # noqa: E501
         """DataType - a model defined in Swagger
 
@@ -25,18 +39,6 @@ class DataType(Model):
         :param description: The description of this DataType.  # noqa: E501
         :type description: str
         """
-        self.swagger_types = {
-            'id': str,
-            'name': str,
-            'description': str
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'name': 'name',
-            'description': 'description'
-        }
-
         self._id = id
         self._name = name
         self._description = description
@@ -17,6 +17,25 @@ class Dataset(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'type': str,
+        'data': str,
+        'design': Design,
+        'parameters': List[Parameter]
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'type': 'type',
+        'data': 'data',
+        'design': 'design',
+        'parameters': 'parameters'
+    }
+
+    # parameter_dict is added by the input_deserializer and df by the analysis worker
+    __slots__ = ('_name', '_type', '_data', '_design', '_parameters', 'parameter_dict', 'df')
+
     def __init__(self, name: str=None, type: str=None, data: str=None, design: Design=None, parameters: List[Parameter]=None):  # noqa: E501
         """Dataset - a model defined in Swagger
 
@@ -31,22 +50,6 @@ class Dataset(Model):
         :param parameters: The parameters of this Dataset.  # noqa: E501
         :type parameters: List[Parameter]
         """
-        self.swagger_types = {
-            'name': str,
-            'type': str,
-            'data': str,
-            'design': Design,
-            'parameters': List[Parameter]
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'type': 'type',
-            'data': 'data',
-            'design': 'design',
-            'parameters': 'parameters'
-        }
-
         self._name = name
         self._type = type
         self._data = data
@@ -15,6 +15,24 @@ class DatasetLoadingStatus(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'status': str,
+        'description': str,
+        'completed': float,
+        'dataset_id': str
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'status': 'status',
+        'description': 'description',
+        'completed': 'completed',
+        'dataset_id': 'dataset_id'
+    }
+
+    __slots__ = ('_id', '_status', '_description', '_completed', '_dataset_id')
+
     def __init__(self, id: str=None, status: str=None, description: str=None, completed: float=None, dataset_id: str=None):  # noqa: E501
         """DatasetLoadingStatus - a model defined in Swagger
 
@@ -29,22 +47,6 @@ class DatasetLoadingStatus(Model):
         :param dataset_id: The dataset_id of this DatasetLoadingStatus.  # noqa: E501
         :type dataset_id: str
         """
-        self.swagger_types = {
-            'id': str,
-            'status': str,
-            'description': str,
-            'completed': float,
-            'dataset_id': str
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'status': 'status',
-            'description': 'description',
-            'completed': 'completed',
-            'dataset_id': 'dataset_id'
-        }
-
         self._id = id
         self._status = status
         self._description = description
@@ -16,6 +16,21 @@ class Design(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'samples': List[str],
+        'comparison': DesignComparison,
+        'analysis_group': List[str]
+    }
+
+    attribute_map = {
+        'samples': 'samples',
+        'comparison': 'comparison',
+        'analysis_group': 'analysisGroup'
+    }
+
+    # additional_properties is added by the input_deserializer
+    __slots__ = ('_samples', '_comparison', '_analysis_group', 'additional_properties')
+
     def __init__(self, samples: List[str]=None, comparison: DesignComparison=None, analysis_group: List[str]=None):  # noqa: E501
         """Design - a model defined in Swagger
 
@@ -26,18 +41,6 @@ class Design(Model):
         :param analysis_group: The analysis_group of this Design.  # noqa: E501
         :type analysis_group: List[str]
         """
-        self.swagger_types = {
-            'samples': List[str],
-            'comparison': DesignComparison,
-            'analysis_group': List[str]
-        }
-
-        self.attribute_map = {
-            'samples': 'samples',
-            'comparison': 'comparison',
-            'analysis_group': 'analysisGroup'
-        }
-
         self._samples = samples
         self._comparison = comparison
         self._analysis_group = analysis_group
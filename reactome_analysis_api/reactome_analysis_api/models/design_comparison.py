@@ -15,6 +15,18 @@ class DesignComparison(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'group1': str,
+        'group2': str
+    }
+
+    attribute_map = {
+        'group1': 'group1',
+        'group2': 'group2'
+    }
+
+    __slots__ = ('_group1', '_group2')
+
     def __init__(self, group1: str=None, group2: str=None):  # noqa: E501
         """DesignComparison - a model defined in Swagger
 
@@ -23,16 +35,6 @@ class DesignComparison(Model):
         :param group2: The group2 of this DesignComparison.  # noqa: E501
         :type group2: str
         """
-        self.swagger_types = {
-            'group1': str,
-            'group2': str
-        }
-
-        self.attribute_map = {
-            'group1': 'group1',
-            'group2': 'group2'
-        }
-
         self._group1 = group1
         self._group2 = group2
 
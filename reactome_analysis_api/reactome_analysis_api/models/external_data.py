@@ -17,6 +17,31 @@ class ExternalData(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'title': str,
+        'type': str,
+        'description': str,
+        'group': str,
+        'sample_ids': List[str],
+        'sample_metadata': List[ExternalDataSampleMetadata],
+        'default_parameters': List[ExternalDataDefaultParameters]
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'title': 'title',
+        'type': 'type',
+        'description': 'description',
+        'group': 'group',
+        'sample_ids': 'sample_ids',
+        'sample_metadata': 'sample_metadata',
+        'default_parameters': 'default_parameters'
+    }
+
+    __slots__ = ('_id', '_title', '_type', '_description', '_group', '_sample_ids', '_sample_metadata',
+                 '_default_parameters')
+
     def __init__(self, id: str=None, title: str=None, type: str=None, description: str=None, group: str=None, sample_ids: List[str]=None, sample_metadata: List[ExternalDataSampleMetadata]=None, default_parameters: List[ExternalDataDefaultParameters]=None):  # noqa: E501
         """ExternalData - a model defined in Swagger
 
@@ -37,28 +62,6 @@ class ExternalData(Model):
         :param default_parameters: The default_parameters of this ExternalData.  # noqa: E501
         :type default_parameters: List[ExternalDataDefaultParameters]
         """
-        self.swagger_types = {
-            'id': str,
-            'title': str,
-            'type': str,
-            'description': str,
-            'group': str,
-            'sample_ids': List[str],
-            'sample_metadata': List[ExternalDataSampleMetadata],
-            'default_parameters': List[ExternalDataDefaultParameters]
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'title': 'title',
-            'type': 'type',
-            'description': 'description',
-            'group': 'group',
-            'sample_ids': 'sample_ids',
-            'sample_metadata': 'sample_metadata',
-            'default_parameters': 'default_parameters'
-        }
-
         self._id = id
         self._title = title
         self._type = type
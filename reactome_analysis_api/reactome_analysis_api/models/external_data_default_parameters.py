@@ -15,6 +15,18 @@ class ExternalDataDefaultParameters(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'value': str
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'value': 'value'
+    }
+
+    __slots__ = ('_name', '_value')
+
     def __init__(self, name: str=None, value: str=None):  # noqa: E501
         """ExternalDataDefaultParameters - a model defined in Swagger
 
@@ -23,16 +35,6 @@ class ExternalDataDefaultParameters(Model):
         :param value: The value of this ExternalDataDefaultParameters.  # noqa: E501
         :type value: str
         """
-        self.swagger_types = {
-            'name': str,
-            'value': str
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'value': 'value'
-        }
-
         self._name = name
         self._value = value
 
@@ -15,6 +15,18 @@ class ExternalDataSampleMetadata(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'values': List[str]
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'values': 'values'
+    }
+
+    __slots__ = ('_name', '_values')
+
     def __init__(self, name: str=None, values: List[str]=None):  # noqa: E501
         """ExternalDataSampleMetadata - a model defined in Swagger
 
@@ -23,16 +35,6 @@ class ExternalDataSampleMetadata(Model):
         :param values: The values of this ExternalDataSampleMetadata.  # noqa: E501
         :type values: List[str]
         """
-        self.swagger_types = {
-            'name': str,
-            'values': List[str]
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'values': 'values'
-        }
-
         self._name = name
         self._values = values
 
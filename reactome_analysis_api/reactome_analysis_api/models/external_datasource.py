@@ -16,6 +16,24 @@ class ExternalDatasource(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'name': str,
+        'description': str,
+        'url': str,
+        'parameters': List[ExternalDatasourceParameters]
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'name': 'name',
+        'description': 'description',
+        'url': 'url',
+        'parameters': 'parameters'
+    }
+
+    __slots__ = ('_id', '_name', '_description', '_url', '_parameters')
+
     def __init__(self, id: str=None, name: str=None, description: str=None, url: str=None, parameters: List[ExternalDatasourceParameters]=None):  # noqa: E501
         """ExternalDatasource - a model defined in Swagger
 
@@ -30,22 +48,6 @@ class ExternalDatasource(Model):
         :param parameters: The parameters of this ExternalDatasource.  # noqa: E501
         :type parameters: List[ExternalDatasourceParameters]
         """
-        self.swagger_types = {
-            'id': str,
-            'name': str,
-            'description': str,
-            'url': str,
-            'parameters': List[ExternalDatasourceParameters]
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'name': 'name',
-            'description': 'description',
-            'url': 'url',
-            'parameters': 'parameters'
-        }
-
         self._id = id
         self._name = name
         self._description = description
@@ -15,6 +15,24 @@ class ExternalDatasourceParameters(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'display_name': str,
+        'type': str,
+        'description': str,
+        'required': bool
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'display_name': 'display_name',
+        'type': 'type',
+        'description': 'description',
+        'required': 'required'
+    }
+
+    __slots__ = ('_name', '_display_name', '_type', '_description', '_required')
+
     def __init__(self, name: str=None, display_name: str=None, type: str=None, description: str=None, required: bool=None):  # noqa: E501
         """ExternalDatasourceParameters - a model defined in Swagger
 
@@ -29,22 +47,6 @@ class ExternalDatasourceParameters(Model):
         :param required: The required of this ExternalDatasourceParameters.  # noqa: E501
         :type required: bool
         """
-        self.swagger_types = {
-            'name': str,
-            'display_name': str,
-            'type': str,
-            'description': str,
-            'required': bool
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'display_name': 'display_name',
-            'type': 'type',
-            'description': 'description',
-            'required': 'required'
-        }
-
         self._name = name
         self._display_name = display_name
         self._type = type
@@ -16,6 +16,20 @@ class Method(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'description': str,
+        'parameters': List[MethodParameters]
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'description': 'description',
+        'parameters': 'parameters'
+    }
+
+    __slots__ = ('_name', '_description', '_parameters')
+
     def __init__(self, name: str=None, description: str=None, parameters: List[MethodParameters]=None):  # noqa: E501
         """Method - a model defined in Swagger
 
@@ -26,18 +40,6 @@ class Method(Model):
         :param parameters: The parameters of this Method.  # noqa: E501
         :type parameters: List[MethodParameters]
         """
-        self.swagger_types = {
-            'name': str,
-            'description': str,
-            'parameters': List[MethodParameters]
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'description': 'description',
-            'parameters': 'parameters'
-        }
-
         self._name = name
         self._description = description
         self._parameters = parameters
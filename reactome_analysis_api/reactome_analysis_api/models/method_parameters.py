@@ -15,6 +15,28 @@ class MethodParameters(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'display_name': str,
+        'type': str,
+        'scope': str,
+        'default': str,
+        'values': List[str],
+        'description': str
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'display_name': 'display_name',
+        'type': 'type',
+        'scope': 'scope',
+        'default': 'default',
+        'values': 'values',
+        'description': 'description'
+    }
+
+    __slots__ = ('_name', '_display_name', '_type', '_scope', '_default', '_values', '_description')
+
     def __init__(self, name: str=None, display_name: str=None, type: str=None, scope: str=None, default: str=None, values: List[str]=None, description: str=None):  # noqa: E501
         """MethodParameters - a model defined in Swagger
 
@@ -33,26 +55,6 @@ class MethodParameters(Model):
         :param description: The description of this MethodParameters.  # noqa: E501
         :type description: str
         """
-        self.swagger_types = {
-            'name': str,
-            'display_name': str,
-            'type': str,
-            'scope': str,
-            'default': str,
-            'values': List[str],
-            'description': str
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'display_name': 'display_name',
-            'type': 'type',
-            'scope': 'scope',
-            'default': 'default',
-            'values': 'values',
-            'description': 'description'
-        }
-
         self._name = name
         self._display_name = display_name
         self._type = type
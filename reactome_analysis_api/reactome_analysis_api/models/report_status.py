@@ -16,6 +16,24 @@ class ReportStatus(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'id': str,
+        'status': str,
+        'description': str,
+        'completed': float,
+        'reports': List[ReportStatusReports]
+    }
+
+    attribute_map = {
+        'id': 'id',
+        'status': 'status',
+        'description': 'description',
+        'completed': 'completed',
+        'reports': 'reports'
+    }
+
+    __slots__ = ('_id', '_status', '_description', '_completed', '_reports')
+
     def __init__(self, id: str=None, status: str=None, description: str=None, completed: float=None, reports: List[ReportStatusReports]=None):  # noqa: E501
         """ReportStatus - a model defined in Swagger
 
@@ -30,22 +48,6 @@ class ReportStatus(Model):
         :param reports: The reports of this ReportStatus.  # noqa: E501
         :type reports: List[ReportStatusReports]
         """
-        self.swagger_types = {
-            'id': str,
-            'status': str,
-            'description': str,
-            'completed': float,
-            'reports': List[ReportStatusReports]
-        }
-
-        self.attribute_map = {
-            'id': 'id',
-            'status': 'status',
-            'description': 'description',
-            'completed': 'completed',
-            'reports': 'reports'
-        }
-
         self._id = id
         self._status = status
         self._description = description
@@ -15,6 +15,20 @@ class ReportStatusReports(Model):
     Do not edit the class manually.
     """
 
+    swagger_types = {
+        'name': str,
+        'url': str,
+        'mimetype': str
+    }
+
+    attribute_map = {
+        'name': 'name',
+        'url': 'url',
+        'mimetype': 'mimetype'
+    }
+
+    __slots__ = ('_name', '_url', '_mimetype')
+
     def __init__(self, name: str=None, url: str=None, mimetype: str=None):  # noqa: E501
         """ReportStatusReports - a model defined in Swagger
 
@@ -25,18 +39,6 @@ class ReportStatusReports(Model):
         :param mimetype: The mimetype of this ReportStatusReports.  # noqa: E501
         :type mimetype: str
         """
-        self.swagger_types = {
-            'name': str,
-            'url': str,
-            'mimetype': str
-        }
-
-        self.attribute_map = {
-            'name': 'name',
-            'url': 'url',
-            'mimetype': 'mimetype'
-        }
-
         self._name = name
         self._url = url
         self._mimetype = mimetype
@@ -1,12 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import time
+
 import grein_loader
+import orjson
 import requests
-import json
 import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 LOGGER = logging.getLogger(__name__)
 
+# the session is shared so that connections are re-used, failed requests are retried
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                       max_retries=Retry(total=3, backoff_factor=0.3)))
+
+# the available datasets only change daily, fetched overviews are therefore re-used for this many seconds
+OVERVIEW_CACHE_TTL = 3600
+
+# caches of all functions decorated with _ttl_cache, used by clear_cache
+_OVERVIEW_CACHES = list()
+
+
+def _ttl_cache(function):
+    """Caches the (non-empty) result of an overview fetching function per no_datasets
+    for OVERVIEW_CACHE_TTL seconds.
+    """
+    cache = dict()
+    _OVERVIEW_CACHES.append(cache)
+
+    @functools.wraps(function)
+    def wrapper(no_datasets: int = None) -> list:
+        cached = cache.get(no_datasets)
+
+        if cached and time.monotonic() - cached[0] < OVERVIEW_CACHE_TTL:
+            return list(cached[1])
+
+        datasets = function(no_datasets)
+
+        # failed requests return an empty list and should be repeated
+        if datasets:
+            cache[no_datasets] = (time.monotonic(), datasets)
+
+        return list(datasets)
+
+    return wrapper
+
 
 class PublicDataFetcher():
+    @staticmethod
+    def clear_cache():
+        """Removes all cached dataset overviews. Must be called before
+        setup_search_events if the index has to reflect changes made within
+        the last OVERVIEW_CACHE_TTL seconds.
+        """
+        for cache in _OVERVIEW_CACHES:
+            cache.clear()
+
     def get_available_datasets(no_datasets: int = None) -> list:
         """Get an overview over all available public datasets.
 
@@ -15,14 +66,16 @@ class PublicDataFetcher():
         :return: A list of public datasets
         :rtype: list
         """
-        datasets = list()
-        datasets += PublicDataFetcher.get_available_datasets_grein(no_datasets)
-        datasets += PublicDataFetcher.get_available_datasets_expression_atlas(no_datasets)
+        # both resources are fetched in parallel since the requests take most of the time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            grein_future = executor.submit(PublicDataFetcher.get_available_datasets_grein, no_datasets)
+            gxa_future = executor.submit(PublicDataFetcher.get_available_datasets_expression_atlas, no_datasets)
 
-        return datasets
+            return grein_future.result() + gxa_future.result()
 
 
     @staticmethod
+    @_ttl_cache
     def get_available_datasets_grein(no_datasets: int = None) -> list:
         """
         Returns the available datasets, is used exclusively during the index build for the keyword searcher
@@ -41,7 +94,7 @@ class PublicDataFetcher():
                 "technology": "",
                 "resource_id": "grein",
                 "resource_id_str": "GREIN",
-                "loading_parameters": json.dumps({"dataset_id": dataset["geo_accession"]}),
+                "loading_parameters": orjson.dumps({"dataset_id": dataset["geo_accession"]}).decode("utf-8"),
                 "link": "https://www.ncbi.nlm.nih.gov/geo/query/acc.cgi?acc="+dataset["geo_accession"]
 
             }
@@ -50,6 +103,7 @@ class PublicDataFetcher():
 
 
     @staticmethod
+    @_ttl_cache
     def get_available_datasets_expression_atlas(no_datasets: int = None) -> list:
         """
         Returns the available datasets, is used exclusively during the index build for the keyword searcher
@@ -63,9 +117,9 @@ class PublicDataFetcher():
         experiments_external_data_list = list()
         try:
             experiments_url = "https://www.ebi.ac.uk/gxa/json/experiments"
-            response = requests.get(experiments_url)
+            response = _SESSION.get(experiments_url, headers={"Accept-Encoding": "gzip"})
             response.raise_for_status()
-            json_response = response.json()
+            json_response = orjson.loads(response.content)
             experiments_list = json_response['experiments'][0:no_datasets]
 
             for experiment in experiments_list:
@@ -78,10 +132,10 @@ class PublicDataFetcher():
                     "technology": experiment['technologyType'],
                     "resource_id": "ebi_gxa",
                     "resource_id_str": "EBI Expression Atlas",
-                    "loading_parameters": json.dumps({"dataset_id": experiment['experimentAccession']}),
+                    "loading_parameters": orjson.dumps({"dataset_id": experiment['experimentAccession']}).decode("utf-8"),
                     "link": "https://www.ebi.ac.uk/gxa/experiments/"+experiment["experimentAccession"]+"/Results"
                 }
                 experiments_external_data_list.append(experiment_data_dict)
-        except requests.exceptions.RequestException:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError):
             LOGGER.error("Response not available")
         return experiments_external_data_list
\ No newline at end of file
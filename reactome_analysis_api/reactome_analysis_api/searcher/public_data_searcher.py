@@ -1,7 +1,9 @@
+import hashlib
+import json
 import logging
 import os
-import pickle
 import click
+import orjson
 
 from whoosh.fields import Schema, TEXT, KEYWORD, NUMERIC
 from whoosh.index import create_in
@@ -13,6 +15,9 @@ from reactome_analysis_api.searcher.overview_fetcher import PublicDataFetcher
 
 LOGGER = logging.getLogger(__name__)
 
+# maximum number of processes used to create the search index
+MAX_INDEX_PROCS = 4
+
 
 class PublicDatasetSearcher():
     """
@@ -30,6 +35,11 @@ class PublicDatasetSearcher():
                     description=TEXT(stored=True), no_samples=NUMERIC(stored=True), technology=TEXT(stored=True),
                     resource_id=TEXT(stored=True), loading_parameters=TEXT(stored=True), link=TEXT(stored=True))
 
+    # the query parsers only depend on the schema and are therefore only created once
+    _description_title_parser = MultifieldParser(["description", "title"], schema)
+    _title_parser = MultifieldParser(["title"], schema)
+    _species_parser = qparser.QueryParser("species", schema)
+
     def __init__(self, path: str):
         """Initialize the public data searcher
 
@@ -47,52 +57,85 @@ class PublicDatasetSearcher():
         if not os.path.exists(path=self._path):
             os.mkdir(self._path)
 
-        ix = create_in(self._path, self.schema)
-
-        LOGGER.debug("Created index: %s", self._path)
-        writer = ix.writer()
-
         LOGGER.debug("Fetching available datasets")
 
         # all available public datasets
         datasets = PublicDataFetcher.get_available_datasets()
 
+        # the index only has to be re-created if the available datasets changed
+        datasets_hash = hashlib.sha256(json.dumps(datasets, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+        if self._is_index_current(datasets_hash):
+            LOGGER.info("Available datasets did not change, keeping existing index")
+            return
+
+        # invalidate the stored hash in case the index creation fails
+        if os.path.exists(self._path + 'datasets.sha256'):
+            os.remove(self._path + 'datasets.sha256')
+
+        ix = create_in(self._path, self.schema)
+
+        LOGGER.debug("Created index: %s", self._path)
+        # the documents are indexed in parallel but merged into a single segment to keep searches fast.
+        # Every process may use up to limitmb of memory, therefore the number of processes is limited
+        writer = ix.writer(procs=min(MAX_INDEX_PROCS, os.cpu_count() or 1), limitmb=256)
+
         for dataset in datasets:
             # ignore datasets without an id (happens sometimes in GREIN)
             if not "id" in dataset or type(dataset["id"]) != str or len(dataset["id"].strip()) < 3:
                 continue
 
-            writer.add_document(data_source=str(dataset['resource_id_str']), id=str(dataset['id']),
+            # fields created by the PublicDataFetcher are always strings, only the external values are converted
+            writer.add_document(data_source=dataset['resource_id_str'], id=dataset['id'],
                                 title=str(dataset['title']),
                                 species=str(dataset['species']),
-                                description=str(dataset['study_summary']), no_samples=str(dataset['no_samples']),
+                                description=str(dataset['study_summary']), no_samples=int(dataset['no_samples']),
                                 technology=str(dataset['technology']),
-                                resource_id=str(dataset['resource_id']),
-                                loading_parameters=str(dataset['loading_parameters']),
-                                link=str(dataset['link']))
+                                resource_id=dataset['resource_id'],
+                                loading_parameters=dataset['loading_parameters'],
+                                link=dataset['link'])
         writer.commit()
 
         # gets species based on public datasets
         species_in_datasets = self._get_species(datasets=datasets)
-        with open(self._path + 'species.pickle', 'wb') as f:
-            pickle.dump(species_in_datasets, f, pickle.HIGHEST_PROTOCOL)
+        with open(self._path + 'species.json', 'wb') as f:
+            f.write(orjson.dumps(species_in_datasets))
+
+        # the hash is only stored once the index is complete
+        with open(self._path + 'datasets.sha256', 'w') as f:
+            f.write(datasets_hash)
+
+        # the index and species are re-loaded on their next use
+        self._ix = None
+        self._species_list = None
+
+    def _is_index_current(self, datasets_hash: str) -> bool:
+        """
+        Checks whether the existing index was created from the same datasets.
+        :param datasets_hash: Hash of the currently available datasets
+        :return: Boolean indicating whether the existing index can be used
+        """
+        if not index.exists_in(self._path) or not os.path.exists(self._path + 'species.json'):
+            return False
+
+        try:
+            with open(self._path + 'datasets.sha256', 'r') as f:
+                return f.read().strip() == datasets_hash
+        except FileNotFoundError:
+            return False
 
     def _get_species(self, datasets) -> set:
         """
         :param datasets: list of dictionaries from public datasets
         :return species_values: list of species in public datasets
         """
-        values = set()
-        for dictionary in datasets:
-            if 'species' in dictionary:
-                values.add(dictionary['species'])
-        species_values = sorted(values)
-        if "character(0)" in species_values: species_values.remove("character(0)")
-        return species_values
+        values = {dictionary['species'] for dictionary in datasets if 'species' in dictionary}
+        values.discard("character(0)")
+        return sorted(values)
 
     def get_species(self) -> list:
         """
-        returns species stored in binary file
+        returns species stored in the species file
         """
         # only try to load if the species list wasn't loaded before
         if self._species_list:
@@ -100,11 +143,11 @@ class PublicDatasetSearcher():
 
         # try to load the list from file
         try:
-            if os.path.exists(self._path + 'species.pickle'):
-                with open(self._path + 'species.pickle', 'rb') as f:
-                    self._species_list = pickle.load(f)
+            if os.path.exists(self._path + 'species.json'):
+                with open(self._path + 'species.json', 'rb') as f:
+                    self._species_list = orjson.loads(f.read())
         except FileNotFoundError:
-            logging.error(f"File not found: {self._path}species.pickle")
+            logging.error(f"File not found: {self._path}species.json")
             self._species_list = []
 
         return self._species_list
@@ -131,29 +174,35 @@ class PublicDatasetSearcher():
         with self._ix.searcher() as searcher:
 
             if search_in_description == True:
-                description_parser = MultifieldParser(["description", "title"], self.schema)
+                description_parser = self._description_title_parser
             else:
-                description_parser = MultifieldParser(["title"], self.schema)
-            species_parser = qparser.QueryParser("species", self.schema)
+                description_parser = self._title_parser
+            species_parser = self._species_parser
 
             query_string = " AND ".join(keyword)
             description_title_query = description_parser.parse(query_string)
             species_query = species_parser.parse(species)
             combined_query = description_title_query & species_query
             results = searcher.search(combined_query, limit=100)
-            results_list = list()
+
+            results_list = []
+
             for result in results:
-                if result["id"] != '':
+                # the stored fields of every hit are only retrieved once
+                fields = result.fields()
+
+                if fields["id"] != '':
                     results_list.append({
-                        "id": result["id"],
-                        "description": result["description"],
-                        "title": result["title"],
-                        "species": result["species"],
-                        "resource_id": result["resource_id"],
-                        "loading_parameters": result["loading_parameters"],
-                        "data_source": result["data_source"],
-                        "web_link": result["link"]
+                        "id": fields["id"],
+                        "description": fields["description"],
+                        "title": fields["title"],
+                        "species": fields["species"],
+                        "resource_id": fields["resource_id"],
+                        "loading_parameters": fields["loading_parameters"],
+                        "data_source": fields["data_source"],
+                        "web_link": fields["link"]
                     })
+
             return results_list
 
 
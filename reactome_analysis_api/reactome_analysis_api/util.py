@@ -3,6 +3,9 @@ import logging
 
 import six
 
+_PRIMITIVE_TYPES = six.integer_types + (float, str, bool)
+
+
 def _deserialize(data, klass):
     """Deserializes dict, list, str into an object.
 
@@ -14,7 +17,15 @@ def _deserialize(data, klass):
     if data is None:
         return None
 
-    if klass in six.integer_types or klass in (float, str, bool):
+    # the generic List and Dict types are identified through their origin
+    # since converting them to a string is comparably slow
+    origin = getattr(klass, "__origin__", None)
+
+    if origin is list:
+        return _deserialize_list(data, klass.__args__[0])
+    elif origin is dict:
+        return _deserialize_dict(data, klass.__args__[1])
+    elif klass in _PRIMITIVE_TYPES:
         return _deserialize_primitive(data, klass)
     elif klass == object:
         return _deserialize_object(data)
@@ -22,10 +33,6 @@ def _deserialize(data, klass):
         return deserialize_date(data)
     elif klass == datetime.datetime:
         return deserialize_datetime(data)
-    elif str(klass).startswith("typing.List"):
-        return _deserialize_list(data, klass.__args__[0])
-    elif str(klass).startswith("typing.Dict"):
-        return _deserialize_dict(data, klass.__args__[1])
     else:
         return deserialize_model(data, klass)
 
@@ -101,11 +108,14 @@ def deserialize_model(data, klass):
     if not instance.swagger_types:
         return data
 
-    for attr, attr_type in six.iteritems(instance.swagger_types):
-        if data is not None \
-                and instance.attribute_map[attr] in data \
-                and isinstance(data, (list, dict)):
-            value = data[instance.attribute_map[attr]]
+    if data is None or not isinstance(data, (list, dict)):
+        return instance
+
+    attribute_map = instance.attribute_map
+
+    for attr, attr_type in instance.swagger_types.items():
+        if attribute_map[attr] in data:
+            value = data[attribute_map[attr]]
             obj = _deserialize(value, attr_type)
             setattr(instance, attr, obj)
 
@@ -122,6 +132,11 @@ def _deserialize_list(data, boxed_type):
     :return: deserialized list.
     :rtype: list
     """
+    # elements that already have the primitive type do not need to be converted
+    if boxed_type in _PRIMITIVE_TYPES:
+        return [sub_data if type(sub_data) is boxed_type else _deserialize(sub_data, boxed_type)
+                for sub_data in data]
+
     return [_deserialize(sub_data, boxed_type)
             for sub_data in data]
 
@@ -14,7 +14,7 @@ VERSION = "1.0.0"
 
 # markupsafe==2.0.1 is needed as 2.1 removed an important function
 REQUIRES = ["connexion", "flask<2", "swagger-ui-bundle >= 0.0.2", "reactome_analysis_utils", "prometheus_client", "markupsafe==2.0.1", 
-            "whoosh", "grein_loader"]
+            "whoosh", "grein_loader", "orjson", "waitress"]
 
 setup(
     name=NAME,
@@ -36,6 +36,15 @@ class ExternalDataTest(unittest.TestCase):
             load_status = client.get("/0.1/data/status/" + token)
             self.assertEqual(404, load_status.status_code)
 
+    def test_download_unknown_identifier(self):
+        with app.app.test_client() as client:
+            # datasets that were never loaded do not have a summary
+            meta_response = client.get("/0.1/data/download/UNKNOWN_DATASET?format=meta")
+            self.assertEqual(404, meta_response.status_code)
+
+            expr_response = client.get("/0.1/data/download/UNKNOWN_DATASET?format=expr")
+            self.assertEqual(404, expr_response.status_code)
+
     def test_external_dataset(self):
         token = "EXAMPLE_MEL_PROT"
 
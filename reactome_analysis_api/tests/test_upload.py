@@ -3,6 +3,7 @@
 import io
 import json
 import os
+import tempfile
 import unittest
 
 import sys
@@ -10,7 +11,7 @@ from reactome_analysis_utils.reactome_storage import ReactomeStorage
 
 sys.path.insert(0, os.path.dirname(__file__))
 
-from reactome_analysis_api.__main__ import app
+from reactome_analysis_api.__main__ import app, _read_upload_lines
 
 
 class TestAnalysisController(unittest.TestCase):
@@ -50,6 +51,11 @@ CD19\t1\t2\t3\t\t\t
 CD20\t1\t2\t3\t\t\t
 MITF\t1\t2\t3\t\t\t"""
 
+    def _upload(self, data: bytes, filename: str = "test.tsv"):
+        """Uploads the data as file without storing it and returns the response."""
+        with app.app.test_client() as client:
+            return client.post("/upload?store=false", data={"file": (io.BytesIO(data), filename)})
+
     def test_failed_get(self):
         with app.app.test_client() as client:
             response = client.get("/upload")
@@ -207,6 +213,142 @@ MITF\t1\t2\t3\t\t\t"""
 
             self.assertEqual("\t" + self.test_tsv, result_obj["data"])
 
+    def test_too_large_file(self):
+        org_max_length = app.app.config["MAX_CONTENT_LENGTH"]
+        app.app.config["MAX_CONTENT_LENGTH"] = 1024 * 1024
+
+        try:
+            response = self._upload(b"a" * 1024 * 1024)
+
+            self.assertEqual(413, response.status_code)
+
+            error_obj = json.loads(response.data.decode())
+
+            self.assertEqual(413, error_obj["status"])
+            self.assertTrue(error_obj["detail"].startswith("The uploaded file is too large."))
+        finally:
+            app.app.config["MAX_CONTENT_LENGTH"] = org_max_length
+
+    def test_excel_file(self):
+        response = self._upload(b"PK\x03\x04\x14\x00\x06\x00\x08\x00\x00\x00!\x00\xb7\xe4", "test.xlsx")
+
+        error_obj = json.loads(response.data.decode())
+
+        self.assertEqual(400, error_obj["status"])
+        self.assertTrue(error_obj["detail"].startswith("MS Excel files are not supported."))
+
+    def test_invalid_encoding_after_header(self):
+        # the invalid byte sequence is only encountered while streaming the file
+        valid_lines = "\n".join(["Gene {}\t1\t2\t3".format(n) for n in range(0, 2000)])
+        test_data = (self.test_tsv + "\n" + valid_lines).encode("UTF-8") + b"\nCD22\t1\t\xff\xfe\t3"
+
+        error_obj = json.loads(self._upload(test_data).data.decode())
+
+        self.assertEqual(400, error_obj["status"])
+        self.assertEqual("Uploaded file is not a text file.", error_obj["detail"])
+
+    def test_duplicate_sample_names(self):
+        error_obj = json.loads(self._upload(b"\tSample 1\t\tSample 1\nCD19\t1\t2\t3\n").data.decode())
+
+        self.assertEqual(400, error_obj["status"])
+        self.assertTrue(error_obj["detail"].startswith("Duplicate sample names detected."))
+
+    def test_delimiter_majority(self):
+        # the semicolon in the quoted sample name must not be used as delimiter
+        response = self._upload(b'"Sample;1",Sample 2,Sample 3\nCD19,1,2,3\nCD20,4,5,6', "test.csv")
+
+        self.assertEqual(200, response.status_code)
+
+        result_obj = json.loads(response.data.decode())
+
+        self.assertEqual(["Sample;1", "Sample 2", "Sample 3"], result_obj["sample_names"])
+        self.assertEqual(3, result_obj["n_lines"])
+
+    def test_delimiter_consistency(self):
+        # the semicolons only occur in the header's sample names
+        response = self._upload(b'Gene,S;1;a,S;2;b,S3\nCD19,1,2,3\nCD20,4,5,6', "test.csv")
+
+        self.assertEqual(200, response.status_code)
+
+        result_obj = json.loads(response.data.decode())
+
+        self.assertEqual(["S;1;a", "S;2;b", "S3"], result_obj["sample_names"])
+
+    def test_duplicate_gene_ids(self):
+        error_obj = json.loads(self._upload((self.test_tsv + "\nCD20\t4\t5\t6").encode("UTF-8")).data.decode())
+
+        self.assertEqual(400, error_obj["status"])
+        self.assertEqual("Duplicate gene identifier 'CD20' detected in line 5.", error_obj["detail"])
+
+    def test_crlf_line_endings(self):
+        response = self._upload(self.test_tsv.replace("\n", "\r\n").encode("UTF-8"))
+
+        self.assertEqual(200, response.status_code)
+
+        result_obj = json.loads(response.data.decode())
+
+        self.assertEqual("Sample 1:Sample 2:Sample 3", ":".join(result_obj["sample_names"]))
+        self.assertEqual("CD19:CD20:MITF", ":".join(result_obj["top_identifiers"]))
+        self.assertEqual("\t" + self.test_tsv, result_obj["data"])
+
+    def test_header_only(self):
+        response = self._upload(b"Sample 1\tSample 2\tSample 3\n")
+
+        self.assertEqual(200, response.status_code)
+
+        result_obj = json.loads(response.data.decode())
+
+        self.assertIsNone(result_obj["sample_names"])
+        self.assertEqual(1, result_obj["n_lines"])
+        self.assertEqual("", result_obj["data"])
+
+    def test_quotes_after_first_lines(self):
+        # quoted fields only appear far into the file
+        unquoted_lines = "\n".join(["Gene {}\t1\t2\t3".format(n) for n in range(0, 10000)])
+        test_data = self.test_tsv + "\n" + unquoted_lines + "\n\"GX\"\t1\t2\t3\n\"A\tB\"\t1\t2\t3"
+
+        response = self._upload(test_data.encode("UTF-8"))
+
+        self.assertEqual(200, response.status_code)
+
+        result_obj = json.loads(response.data.decode())
+        data_lines = result_obj["data"].split("\n")
+
+        self.assertEqual("GX\t1\t2\t3", data_lines[-2])
+        self.assertEqual("A\tB\t1\t2\t3", data_lines[-1])
+
+    def test_large_upload(self):
+        # large uploads are spooled to disk and memory-mapped
+        gene_lines = "\n".join(["Gene {}\t1\t2\t3".format(n) for n in range(0, 50000)])
+        test_data = self.test_tsv + "\n" + gene_lines
+
+        response = self._upload(test_data.encode("UTF-8"))
+
+        self.assertEqual(200, response.status_code)
+
+        result_obj = json.loads(response.data.decode())
+
+        self.assertEqual("Sample 1:Sample 2:Sample 3", ":".join(result_obj["sample_names"]))
+        self.assertEqual(50004, result_obj["n_lines"])
+        self.assertEqual("\t" + test_data, result_obj["data"])
+
+    def test_spooled_upload(self):
+        # small uploads must be read without writing them to disk
+        with tempfile.SpooledTemporaryFile(max_size=1024) as stream:
+            stream.write(self.test_tsv.encode("UTF-8"))
+            stream.seek(0)
+
+            self.assertEqual(self.test_tsv, "".join(_read_upload_lines(stream)))
+            self.assertFalse(stream._rolled)
+
+        # uploads already spooled to disk are memory-mapped
+        with tempfile.SpooledTemporaryFile(max_size=10) as stream:
+            stream.write(self.test_tsv.encode("UTF-8"))
+            stream.seek(0)
+
+            self.assertTrue(stream._rolled)
+            self.assertEqual(self.test_tsv, "".join(_read_upload_lines(stream)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -20,6 +20,7 @@ import logging
 import os
 import sys
 import signal
+import threading
 
 import pika
 import pika.exceptions
@@ -44,6 +45,29 @@ class ReactomeMQException(Exception):
     pass
 
 
+_THREAD_MQS = threading.local()
+
+
+def get_thread_mq(queue_name: str = ANALYSIS_QUEUE) -> "ReactomeMQ":
+    """Returns a ReactomeMQ object for the specified queue that is shared
+    by all calls from the current thread. Thereby, the connection to the
+    queuing system is kept open and re-used to post subsequent messages.
+
+    :param queue_name: Name of the queue to use.
+    :return: The ReactomeMQ object
+    """
+    thread_mqs = getattr(_THREAD_MQS, "mqs", None)
+
+    if thread_mqs is None:
+        thread_mqs = dict()
+        _THREAD_MQS.mqs = thread_mqs
+
+    if queue_name not in thread_mqs:
+        thread_mqs[queue_name] = ReactomeMQ(queue_name=queue_name)
+
+    return thread_mqs[queue_name]
+
+
 class ReactomeMQ:
     """
     Class used to manage all queuing systems in the Reactome Analysis System
@@ -66,9 +90,10 @@ class ReactomeMQ:
         self._channel = None
         self._shutdown = False
 
-        # stop analyses on TERM signals
-        signal.signal(signal.SIGTERM, self._on_signal)
-        signal.signal(signal.SIGINT, self._on_signal)
+        # stop analyses on TERM signals - handlers can only be set in the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._on_signal)
+            signal.signal(signal.SIGINT, self._on_signal)
 
     def _get_queue_arguments(self) -> dict:
         """Returns the arguments used to create the queues
@@ -97,7 +122,18 @@ class ReactomeMQ:
         """
         # only allow a 3 second socket timeout for posting analysis requests
         try:
-            channel = self._connect(3).channel()
+            reuses_connection = self.connection is not None
+
+            try:
+                channel = self._connect(3).channel()
+            except pika.exceptions.AMQPError:
+                if not reuses_connection:
+                    raise
+
+                # the re-used connection may have been closed in the meantime
+                LOGGER.debug("Re-connecting to queuing system")
+                self.connection = None
+                channel = self._connect(3).channel()
         except Exception as e:
             raise ReactomeMQException("Failed to connect to queuing system: " + str(e))
 
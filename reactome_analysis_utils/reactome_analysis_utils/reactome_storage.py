@@ -14,6 +14,7 @@ This script makes use of the following environmental variables (if present):
 
 import logging
 import os
+import time
 import zlib
 
 import redis
@@ -34,6 +35,11 @@ class ReactomeStorage:
     If set, compression is used when retrieving and storing data.
     """
     USE_COMPRSSSION = True
+
+    """
+    Redis clients shared by all instances, indexed by their configuration.
+    """
+    _redis_clients = dict()
     
     """
     Contains all functions to interact with the storage
@@ -73,13 +79,15 @@ class ReactomeStorage:
         except Exception as e:
             raise ReactomeStorageException(e)
 
-    def set_status(self, analysis_identifier: str, status: str, data_type: str = "analysis"):
+    def set_status(self, analysis_identifier: str, status: str, data_type: str = "analysis", nx: bool = False) -> bool:
         """
         Set the status of the analysis.
 
         :param analysis_identifier: The analysis' identifier
         :param data_type: The data type to get the status for ["analysis", "report", "dataset"]
         :param status: The status as JSON encoded string
+        :param nx: If set, the status is only set if no status exists for the identifier yet.
+        :return: Boolean indicating whether the status was set
         """
         try:
             if data_type == "report":
@@ -92,7 +100,67 @@ class ReactomeStorage:
                 raise ReactomeStorageException("Unknown type passed: " + data_type)
 
             LOGGER.debug("Setting status for {}: {}".format(analysis_identifier, status))
-            self.r.set(status_key, status)
+
+            # a new status cannot have any listeners yet
+            if nx:
+                return bool(self.r.set(status_key, status, nx=nx))
+
+            # notify clients waiting for a status update. PUBLISH cannot be part of a
+            # pipeline when using a redis cluster, therefore, two separate commands are used.
+            was_set = self.r.set(status_key, status)
+            self.r.publish(status_key, status)
+
+            return bool(was_set)
+        except Exception as e:
+            raise ReactomeStorageException(e)
+
+    def wait_for_status_update(self, analysis_identifier: str, current_status, data_type: str = "analysis",
+                               timeout: float = 30) -> str:
+        """
+        Waits until the status of the analysis changes. Updates are received through
+        the notifications published by set_status.
+
+        :param analysis_identifier: The analysis' identifier
+        :param current_status: The status the client already has
+        :param data_type: The data type to get the status for ["analysis", "report", "dataset"]
+        :param timeout: Maximum time to wait for an update in seconds
+        :return: The updated status or the current status if the timeout was reached.
+        """
+        try:
+            if data_type == "report":
+                status_key = self._get_report_status_key(analysis_identifier)
+            elif data_type == "analysis":
+                status_key = self._get_status_key(analysis_identifier)
+            elif data_type == "dataset":
+                status_key = self._get_request_data_status_key(analysis_identifier)
+            else:
+                raise ReactomeStorageException("Unknown type passed: " + data_type)
+
+            pubsub = self.r.pubsub(ignore_subscribe_messages=True)
+
+            try:
+                pubsub.subscribe(status_key)
+
+                # the status may have changed before the subscription was active
+                status = self.r.get(status_key)
+
+                if status != current_status:
+                    return status
+
+                deadline = time.monotonic() + timeout
+                remaining = timeout
+
+                while remaining > 0:
+                    message = pubsub.get_message(timeout=remaining)
+
+                    if message is not None and message["type"] == "message":
+                        return message["data"]
+
+                    remaining = deadline - time.monotonic()
+
+                return status
+            finally:
+                pubsub.close()
         except Exception as e:
             raise ReactomeStorageException(e)
 
@@ -127,6 +195,41 @@ class ReactomeStorage:
         except Exception as e:
             raise ReactomeStorageException(e)
 
+    def get_result_chunks(self, analysis_identifier: str, data_type: str = "analysis", chunk_size: int = 256 * 1024):
+        """
+        Retrieve the result from storage in chunks. In contrast to `get_result`, the
+        result is never loaded into memory completely.
+
+        :param analysis_identifier: The analysis' identifier
+        :param data_type: The data type to get the result for ["analysis", "report", "pdf_report", "r_script"]
+        :param chunk_size: The maximum number of bytes to retrieve from storage at once.
+        :return: A generator returning the result's chunks as bytes or None if it does not exist.
+        """
+        try:
+            if data_type == "report":
+                result_key = self._get_report_result_key(analysis_identifier)
+            elif data_type == "pdf_report":
+                result_key = self._get_pdf_report_result_key(analysis_identifier)
+            elif data_type == "analysis":
+                result_key = self._get_result_key(analysis_identifier)
+            elif data_type == "r_script":
+                result_key = self._get_r_script_result_key(analysis_identifier)
+            else:
+                raise ReactomeStorageException("Unknown type passed: " + data_type)
+
+            LOGGER.debug("Getting result chunks for {}".format(analysis_identifier))
+            result_length = self.r.strlen(result_key)
+        except Exception as e:
+            raise ReactomeStorageException(e)
+
+        if not result_length:
+            return None
+
+        # the result is the only data that improves with compression
+        decompress = data_type == "analysis" and ReactomeStorage.USE_COMPRSSSION
+
+        return self._get_chunks(result_key, result_length, chunk_size, decompress)
+
     def set_result(self, analysis_identifier: str, result: str, data_type: str = "analysis"):
         """
         Store the result for the specified analysis
@@ -180,10 +283,32 @@ class ReactomeStorage:
 
             request_key = self._get_request_data_key(token)
 
-            self.r.set(request_key, data)
+            # the value and its expiry are set in a single call
+            self.r.set(request_key, data, ex=expire if expire is not None and expire > 0 else None)
+        except Exception as e:
+            raise ReactomeStorageException(e)
+
+    def set_request_data_nx(self, token: str, data, expire: int = 3600) -> bool:
+        """
+        Stores the passed request data under the specified token only if the token
+        does not exist yet. This is performed as a single, atomic operation.
+        :param token: The token to store the data under
+        :param data: The data to store. May also be a binary file object.
+        :param expire: If not none, the key will be expired in `expire` seconds. Default = 60 Minutes = 3600 seconds.
+        :return: Boolean indicating whether the data was stored
+        """
+        try:
+            if ReactomeStorage.USE_COMPRSSSION:
+                data = ReactomeStorage._compress_data(data)
+            elif hasattr(data, "read"):
+                data = data.read()
+
+            request_key = self._get_request_data_key(token)
 
             if expire is not None and expire > 0:
-                self.r.expire(request_key, expire)
+                return bool(self.r.set(request_key, data, nx=True, ex=expire))
+
+            return bool(self.r.set(request_key, data, nx=True))
         except Exception as e:
             raise ReactomeStorageException(e)
 
@@ -204,6 +329,25 @@ class ReactomeStorage:
         except Exception as e:
             raise ReactomeStorageException(e)
         
+    def get_request_data_chunks(self, token: str, chunk_size: int = 256 * 1024):
+        """
+        Retrieve the stored request data for the given token in chunks. In contrast
+        to `get_request_data`, the data is never loaded into memory completely.
+        :param token: The token under which the data was stored
+        :param chunk_size: The maximum number of bytes to retrieve from storage at once.
+        :return: A generator returning the data's chunks as bytes or None if it does not exist.
+        """
+        try:
+            request_key = self._get_request_data_key(token)
+            data_length = self.r.strlen(request_key)
+        except Exception as e:
+            raise ReactomeStorageException(e)
+
+        if not data_length:
+            return None
+
+        return self._get_chunks(request_key, data_length, chunk_size, ReactomeStorage.USE_COMPRSSSION)
+
     def del_request_data(self, token: str) -> None:
         """
         Removes the request data for the specified token.
@@ -242,10 +386,8 @@ class ReactomeStorage:
             if ReactomeStorage.USE_COMPRSSSION:
                 data = ReactomeStorage._compress_data(data)
 
-            self.r.set(request_key, data)
-
-            if expire is not None and expire > 0:
-                self.r.expire(request_key, expire)
+            # the value and its expiry are set in a single call
+            self.r.set(request_key, data, ex=expire if expire is not None and expire > 0 else None)
         except Exception as e:
             raise ReactomeStorageException(e)
 
@@ -319,10 +461,8 @@ class ReactomeStorage:
             if ReactomeStorage.USE_COMPRSSSION:
                 data = ReactomeStorage._compress_data(data)
             
-            self.r.set(name=request_key, value=data)
-
-            if expire is not None and expire > 0:
-                self.r.expire(request_key, expire)
+            # the value and its expiry are set in a single call
+            self.r.set(request_key, data, ex=expire if expire is not None and expire > 0 else None)
         except Exception as e:
             raise ReactomeStorageException(e)
         
@@ -340,6 +480,39 @@ class ReactomeStorage:
             # ignore all errors
             pass
 
+    def _get_chunks(self, key: str, length: int, chunk_size: int, decompress: bool):
+        """
+        Retrieves the value stored under `key` in chunks using GETRANGE.
+
+        :param key: The key to retrieve
+        :param length: The length of the stored value in bytes
+        :param chunk_size: The maximum number of bytes to retrieve at once
+        :param decompress: If set, the value is decompressed on the fly
+        :return: A generator returning the (decompressed) chunks as bytes
+        """
+        decompressor = zlib.decompressobj() if decompress else None
+
+        for start in range(0, length, chunk_size):
+            try:
+                chunk = self.r.getrange(key, start, start + chunk_size - 1)
+
+                if decompressor is not None:
+                    try:
+                        chunk = decompressor.decompress(chunk)
+                    except zlib.error as e:
+                        # this indicates that the data might not have been compressed
+                        if start > 0 or "incorrect header check" not in str(e):
+                            raise e
+
+                        decompressor = None
+            except Exception as e:
+                raise ReactomeStorageException(e)
+
+            yield chunk
+
+        if decompressor is not None:
+            yield decompressor.flush()
+
     @staticmethod
     def _get_redis():
         """
@@ -347,8 +520,9 @@ class ReactomeStorage:
         environmental variables.
 
         The redis API already uses an internal, thread-safe
-        connection pool. Therefore, no additional connection
-        pool has to be created.
+        connection pool. The client is therefore shared by all
+        ReactomeStorage objects using the same configuration
+        so that connections are reused across requests.
 
         :return: A Redis connection pointing towards our redis instance.
         """
@@ -359,9 +533,16 @@ class ReactomeStorage:
         redis_port = int(os.getenv("REDIS_PORT", 6379))
         redis_database = int(os.getenv("REDIS_DATABASE", 0))
         use_redis_cluster = os.getenv("USE_REDIS_CLUSTER", "False") == "True"
+        redis_password_file = os.getenv("REDIS_PASSWORD_FILE", None)
+        redis_env_password = os.getenv("REDIS_PASSWORD", None)
+
+        # re-use an existing client
+        client_key = (redis_host, redis_port, redis_database, use_redis_cluster, redis_password_file, redis_env_password)
+
+        if client_key in ReactomeStorage._redis_clients:
+            return ReactomeStorage._redis_clients[client_key]
 
         # load the password from file if set
-        redis_password_file = os.getenv("REDIS_PASSWORD_FILE", None)
         redis_password = None
 
         if redis_password_file and os.path.isfile(redis_password_file):
@@ -372,8 +553,6 @@ class ReactomeStorage:
                         redis_password = line
 
         # environment variable overwrites file
-        redis_env_password = os.getenv("REDIS_PASSWORD", None)
-
         if redis_env_password:
             redis_password = redis_env_password
 
@@ -393,6 +572,8 @@ class ReactomeStorage:
                                            retry_on_timeout=False, socket_keepalive=False, socket_timeout=3,
                                            socket_connect_timeout=3)
 
+        ReactomeStorage._redis_clients[client_key] = redis_connection
+
         return redis_connection
 
     @staticmethod
@@ -506,13 +687,23 @@ class ReactomeStorage:
         return "analysis_request:{}:data".format(token)
 
     @staticmethod
-    def _compress_data(data: str):
-        """Compress the string data
+    def _compress_data(data):
+        """Compress the data
 
-        :param data: The data to compress
-        :type data: str
+        :param data: The data to compress. Binary file objects are read and compressed in chunks.
+        :type data: str, bytes, or binary file object
         """
-        compressed = zlib.compress(data.encode("utf-8"), level=9)
+        if hasattr(data, "read"):
+            compressor = zlib.compressobj(level=9)
+            compressed = [compressor.compress(chunk) for chunk in iter(lambda: data.read(1024 * 1024), b"")]
+            compressed.append(compressor.flush())
+
+            return b"".join(compressed)
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        compressed = zlib.compress(data, level=9)
 
         return compressed
     
@@ -521,9 +712,13 @@ class ReactomeStorage:
 
         :param compresse: The compressed data
         :type compresse: A byte object
-        :return: The decompressed string
+        :return: The decompressed string or None if no data was passed
         :rtype: str
         """
+        # missing keys are returned as None by redis
+        if compressed is None:
+            return None
+
         try:
             data = zlib.decompress(compressed).decode("utf-8")
         except zlib.error as e:
@@ -1,5 +1,11 @@
+import io
+import threading
 import unittest
 import os
+from unittest import mock
+
+import redis.cluster
+import redis.exceptions
 
 from reactome_analysis_utils import reactome_storage
 
@@ -18,6 +24,120 @@ class ReactomeStorageTest(unittest.TestCase):
 
         self.assertFalse(exists)
 
+    def test_shared_connection(self):
+        storage_1 = reactome_storage.ReactomeStorage()
+        storage_2 = reactome_storage.ReactomeStorage()
+
+        # the same configuration must re-use the client
+        self.assertIs(storage_1.r, storage_2.r)
+
+        os.environ["REDIS_DATABASE"] = "1"
+
+        try:
+            storage_3 = reactome_storage.ReactomeStorage()
+            self.assertIsNot(storage_1.r, storage_3.r)
+        finally:
+            del os.environ["REDIS_DATABASE"]
+
+    def test_set_request_data_nx(self):
+        storage = reactome_storage.ReactomeStorage()
+
+        test_token = "TEST_NX"
+        storage.del_request_data(test_token)
+
+        # the first call must store the data
+        self.assertTrue(storage.set_request_data_nx(token=test_token, data="first", expire=60))
+
+        # existing tokens must not be overwritten
+        self.assertFalse(storage.set_request_data_nx(token=test_token, data="second", expire=60))
+        self.assertEqual("first", storage.get_request_data(token=test_token))
+
+        storage.del_request_data(test_token)
+
+        # binary file objects are compressed in chunks
+        self.assertTrue(storage.set_request_data_nx(token=test_token, data=io.BytesIO(b"file data"), expire=60))
+        self.assertEqual("file data", storage.get_request_data(token=test_token))
+
+        storage.del_request_data(test_token)
+
+    def test_set_status_nx(self):
+        storage = reactome_storage.ReactomeStorage()
+
+        test_id = "TEST_STATUS_NX"
+        storage.set_status(analysis_identifier=test_id, status="first")
+
+        # existing statuses must not be overwritten
+        self.assertFalse(storage.set_status(analysis_identifier=test_id, status="second", nx=True))
+        self.assertEqual(b"first", storage.get_status(analysis_identifier=test_id))
+
+        self.assertTrue(storage.set_status(analysis_identifier=test_id, status="second"))
+        self.assertEqual(b"second", storage.get_status(analysis_identifier=test_id))
+
+    def test_wait_for_status_update(self):
+        storage = reactome_storage.ReactomeStorage()
+
+        test_id = "TEST_STATUS_WAIT"
+        storage.set_status(analysis_identifier=test_id, status="running", data_type="dataset")
+
+        # no update within the timeout returns the current status
+        self.assertEqual(b"running", storage.wait_for_status_update(test_id, b"running", data_type="dataset",
+                                                                    timeout=0.2))
+
+        # an outdated status is returned immediately
+        self.assertEqual(b"running", storage.wait_for_status_update(test_id, b"queued", data_type="dataset"))
+
+        # updates are received while waiting
+        timer = threading.Timer(0.2, storage.set_status, kwargs={"analysis_identifier": test_id,
+                                                                 "status": "complete", "data_type": "dataset"})
+        timer.start()
+
+        self.assertEqual(b"complete", storage.wait_for_status_update(test_id, b"running", data_type="dataset",
+                                                                     timeout=5))
+        timer.join()
+
+    def test_set_status_cluster(self):
+        storage = reactome_storage.ReactomeStorage()
+
+        # cluster pipelines do not support PUBLISH
+        storage.r = mock.create_autospec(redis.cluster.RedisCluster, instance=True)
+        storage.r.pipeline.return_value.publish.side_effect = redis.exceptions.RedisClusterException(
+            "ERROR: Calling pipelined function publish is blocked when running redis in cluster mode...")
+        storage.r.set.return_value = True
+
+        self.assertTrue(storage.set_status(analysis_identifier="TEST_STATUS_CLUSTER", status="running"))
+        storage.r.set.assert_called_once_with("analysis:TEST_STATUS_CLUSTER:status", "running")
+        storage.r.publish.assert_called_once_with("analysis:TEST_STATUS_CLUSTER:status", "running")
+
+    def test_get_chunks(self):
+        storage = reactome_storage.ReactomeStorage()
+
+        test_data = "\n".join(["Gene {}\t{}".format(n, n * 2) for n in range(0, 5000)])
+        test_token = "TEST_CHUNKS"
+
+        # compressed results
+        storage.set_result(analysis_identifier=test_token, result=test_data, data_type="analysis")
+        chunks = storage.get_result_chunks(analysis_identifier=test_token, data_type="analysis", chunk_size=100)
+
+        self.assertEqual(test_data, b"".join(chunks).decode("UTF-8"))
+
+        # uncompressed results
+        storage.set_result(analysis_identifier=test_token, result=test_data, data_type="r_script")
+        chunks = storage.get_result_chunks(analysis_identifier=test_token, data_type="r_script", chunk_size=100)
+
+        self.assertEqual(test_data, b"".join(chunks).decode("UTF-8"))
+
+        # request data
+        storage.set_request_data(token=test_token, data=test_data)
+        chunks = storage.get_request_data_chunks(token=test_token, chunk_size=100)
+
+        self.assertEqual(test_data, b"".join(chunks).decode("UTF-8"))
+
+        storage.del_request_data(test_token)
+
+        # missing data
+        self.assertIsNone(storage.get_request_data_chunks(token=test_token))
+        self.assertIsNone(storage.get_result_chunks(analysis_identifier="MISSING_CHUNKS"))
+
     def test_compression(self):
         reactome_storage.ReactomeStorage.USE_COMPRSSSION = True
 
@@ -44,6 +164,9 @@ class ReactomeStorageTest(unittest.TestCase):
 
         self.assertEqual(test_data, fetched_data, msg="Request data summary does not match")
 
+        # missing data is returned as None
+        self.assertIsNone(storage.get_request_data_summary(token="TEST_MISSING_SUMMARY"))
+
         # analysis request data - the request object
         storage.set_analysis_request_data(token=test_token, data=test_data)
         fetched_data = storage.get_analysis_request_data(token=test_token)